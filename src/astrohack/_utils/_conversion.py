@@ -5,17 +5,17 @@ from astrohack._utils._constants import *
 
 
 def _convert_ant_name_to_id(ant_list, ant_names):
-    """_summary_
+    """Get the ids of the named antennas
 
   Args:
-      ant_list (_type_): _description_
-      ant_names (_type_): _description_
+      ant_list (numpy.ndarray): Antenna names ordered by antenna id
+      ant_names (list or str): Name or names of the antennas to be converted
 
   Returns:
-      _type_: _description_
+      numpy.ndarray: Sorted ids of the antennas in ant_list whose names are in ant_names
   """
 
-    return np.nonzero(np.in1d(ant_list, ant_names))[0]
+    return np.flatnonzero(np.isin(ant_list, ant_names))
 
 
 # Global conversion functions
@@ -94,17 +94,3 @@ def _to_stokes(grid, pol):
         raise Exception("Pol not supported " + str(pol))
 
     return grid_stokes
-
-
-def convert_dict_from_numba(func):
-    def wrapper(*args, **kwargs):
-        numba_dict = func(*args, **kwargs)
-
-        converted_dict = dict(numba_dict)
-
-        for key, _ in numba_dict.items():
-            converted_dict[key] = dict(converted_dict[key])
-
-        return converted_dict
-
-    return wrapper
@@ -5,51 +5,75 @@ import graphviper.utils.logger as logger
 from astrohack._utils._tools import _param_to_list
 
 
-def _construct_general_graph_recursively(
+def _add_chunk_to_graph(data, chunk_function, param_dict, delayed_list, parallel):
+    """
+    Adds a call of the chunk function over a leaf of the looping dictionary to the graph, or executes it right away
+    when not in parallel mode
+    Args:
+        data: The leaf of the looping dictionary, either a xarray dataset or a dictionary
+        chunk_function: The chunk function to be executed
+        param_dict: The parameter dictionary for the chunk function
+        delayed_list: List of delayed calls to which the call is appended
+        parallel: Are loops to be executed in parallel?
+    """
+    if isinstance(data, xarray.Dataset):
+        param_dict['xds_data'] = data
+    elif isinstance(data, dict):
+        param_dict['data_dict'] = data
+    if parallel:
+        delayed_list.append(dask.delayed(chunk_function)(dask.delayed(param_dict)))
+    else:
+        delayed_list.append(0)
+        chunk_function(param_dict)
+
+
+def _construct_general_graph(
         looping_dict,
         chunk_function,
         param_dict,
         delayed_list,
         key_order,
-        parallel=False,
-        oneup=None
+        parallel=False
 ):
-
-    
+    """
+    Walks the looping dictionary depth first in key_order, adding one chunk function call per leaf to the graph
+    Args:
+        looping_dict: The dictionary containing the keys over which the loops are to be executed
+        chunk_function: The chunk function to be executed
+        param_dict: The parameter dictionary for the chunk function
+        delayed_list: List of delayed calls to which the calls are appended
+        key_order: The order over which to loop over the keys inside the looping dictionary
+        parallel: Are loops to be executed in parallel?
+    """
     if len(key_order) == 0:
-        if isinstance(looping_dict, xarray.Dataset):
-            param_dict['xds_data'] = looping_dict
-        elif isinstance(looping_dict, dict):
-            param_dict['data_dict'] = looping_dict
-        if parallel:
-            delayed_list.append(dask.delayed(chunk_function)(dask.delayed(param_dict)))
+        _add_chunk_to_graph(looping_dict, chunk_function, param_dict, delayed_list, parallel)
+        return
+
+    # Each level holds the items still to be visited, the dictionary they belong to and the key of that dictionary
+    # one level up, the items of a level can only be listed when it is reached as 'all' depends on its contents
+    levels = [(iter(_param_to_list(param_dict[key_order[0]], looping_dict, key_order[0])), looping_dict, None)]
+    while len(levels) > 0:
+        items, current_dict, oneup = levels[-1]
+        depth = len(levels)
+        key = key_order[depth-1]
+        item = next(items, None)
+        if item is None:
+            levels.pop()
+        elif 'info' in item:
+            pass
         else:
-            delayed_list.append(0)
-            chunk_function(param_dict)
-    else:
-        key = key_order[0]
-        exec_list = _param_to_list(param_dict[key], looping_dict, key)
-        for item in exec_list:
-            if 'info' in item:
-                pass
-            else:
-                param_dict[f'this_{key}'] = item
-                if item in looping_dict:
-                    _construct_general_graph_recursively(
-                        looping_dict[item],
-                        chunk_function,
-                        param_dict,
-                        delayed_list,
-                        key_order[1:],
-                        parallel=parallel,
-                        oneup=item
-                    )
-                    
+            param_dict[f'this_{key}'] = item
+            if item not in current_dict:
+                if oneup is None:
+                    logger.warning(f'{item} is not present in looping dict')
                 else:
-                    if oneup is None:
-                        logger.warning(f'{item} is not present in looping dict')
-                    else:
-                        logger.warning(f'{item} is not present for {oneup}')
+                    logger.warning(f'{item} is not present for {oneup}')
+            elif depth == len(key_order):
+                _add_chunk_to_graph(current_dict[item], chunk_function, param_dict, delayed_list, parallel)
+            else:
+                next_key = key_order[depth]
+                next_dict = current_dict[item]
+                levels.append((iter(_param_to_list(param_dict[next_key], next_dict, next_key)), next_dict, item))
 
 
 def _dask_general_compute(looping_dict, chunk_function, param_dict, key_order, parallel=False):
@@ -67,7 +91,7 @@ def _dask_general_compute(looping_dict, chunk_function, param_dict, key_order, p
     """
     
     delayed_list = []
-    _construct_general_graph_recursively(
+    _construct_general_graph(
         looping_dict,
         chunk_function,
         param_dict,
@@ -6,23 +6,13 @@ from astropy.time import Time
 
 
 def _calc_index(n, m):
-    if n >= m:
-        return n % m
-    else:
-        return n
-
+    return n % m
 
-def _extract_indices(l, m, squared_radius):
-    indices = []
 
+def _extract_mask(l, m, squared_radius):
     assert l.shape[0] == m.shape[0], "l, m must be same size."
 
-    for i in range(l.shape[0]):
-        squared_sum = np.power(l[i], 2) + np.power(m[i], 2)
-        if squared_sum <= squared_radius:
-            indices.append(i)
-
-    return np.array(indices)
+    return l * l + m * m <= squared_radius
 
 
 def _matplotlib_calibration_inspection_function(data, delta=0.01, pol='RR', width=1000, height=450):
@@ -37,13 +27,13 @@ def _matplotlib_calibration_inspection_function(data, delta=0.01, pol='RR', widt
 
     assert l.shape[0] == m.shape[0], "l, m dimensions don't match!"
 
-    indices = _extract_indices(
+    mask = _extract_mask(
         l=l,
         m=m,
         squared_radius=radius
     )
 
-    vis = data.isel(time=indices).VIS
+    vis = data.VIS.isel(time=mask)
     times = Time(vis.time.data - UNIX_CONVERSION, format='unix').iso
 
     fig, axis = _create_figure_and_axes([width * pixels, height * pixels], [2, 1])
@@ -81,121 +71,118 @@ def _plotly_calibration_inspection_function(data, delta=0.01, pol='RR', width=10
 
     assert l.shape[0] == m.shape[0], "l, m dimensions don't match!"
 
-    indices = _extract_indices(
+    mask = _extract_mask(
         l=l,
         m=m,
         squared_radius=radius
     )
 
-    vis = data.isel(time=indices).VIS
+    vis = data.VIS.isel(time=mask)
     times = Time(vis.time.data - UNIX_CONVERSION, format='unix').iso
 
     chan = np.arange(0, data.chan.data.shape[0])
     fig = make_subplots(rows=2, cols=1, start_cell="top-left")
 
+    hovertemplate = "<br>".join([
+        '<b>time: %{meta[0]}</b><extra></extra>',
+        'chan:%{x}',
+        'vis: %{y}'
+    ])
+    real_traces = []
+    imag_traces = []
     for i in range(times.shape[0]):
-        index = _calc_index(i, 10)
-        fig.add_trace(
+        color = px.colors.qualitative.D3[_calc_index(i, 10)]
+        marker = {
+            'color': color,
+            'line': {
+                'width': 3,
+                'color': color
+            }
+        }
+        real_traces.append(
             go.Scatter(
                 x=chan,
                 y=vis[i, :, pol_index].real,
-                marker={
-                    'color': px.colors.qualitative.D3[index],
-                    'line': {
-                        'width': 3,
-                        'color': px.colors.qualitative.D3[index]
-                    }
-                },
+                marker=marker,
                 mode='lines+markers',
                 name=times[i],
                 legendgroup=times[i],
                 meta=[times[i]],
-                hovertemplate="<br>".join([
-                    '<b>time: %{meta[0]}</b><extra></extra>',
-                    'chan:%{x}',
-                    'vis: %{y}'
-                ])
-            ), row=1, col=1
+                hovertemplate=hovertemplate
+            )
         )
 
-        fig.add_trace(
+        imag_traces.append(
             go.Scatter(
                 x=chan,
                 y=vis[i, :, pol_index].imag,
-                marker={
-                    'color': px.colors.qualitative.D3[index],
-                    'line': {
-                        'width': 3,
-                        'color': px.colors.qualitative.D3[index]
-                    }
-                },
+                marker=marker,
                 mode='lines+markers',
                 name=times[i],
                 legendgroup=times[i],
                 showlegend=False,
                 meta=[times[i]],
-                hovertemplate="<br>".join([
-                    '<b>time: %{meta[0]}</b><extra></extra>',
-                    'chan:%{x}',
-                    'vis: %{y}'
-                ])
-            ), row=2, col=1
+                hovertemplate=hovertemplate
+            )
         )
 
-        fig['layout'] = {
-            'height': height,
-            'width': width,
-            'title': 'Calibration Check: polarization={p}'.format(p=data.pol.values[pol_index]),
-            'paper_bgcolor': '#FFFFFF',
-            'plot_bgcolor': '#FFFFFF',
-            'font_color': '#323130',
-            'yaxis': {
-                'title': 'Visibilities (real)',
-                'linecolor': '#626567',
-                'linewidth': 2,
-                'zeroline': False,
-                'mirror': True,
-                'showline': True,
-                'anchor': 'x',
-                'domain': [0.575, 1.0],
-                # 'showspikes': True,
-                # 'spikemode': 'across',
-                # 'spikesnap': 'cursor',
-            },
-            'yaxis2': {
-                'title': 'Visibilities (imag)',
-                'linecolor': '#626567',
-                'linewidth': 2,
-                'zeroline': False,
-                'mirror': True,
-                'showline': True,
-                'anchor': 'x2',
-                'domain': [0.0, 0.425]
-            },
-            'xaxis': {
-                'title': 'Channel',
-                'zeroline': False,
-                'linecolor': ' #626567',
-                'linewidth': 2,
-                'mirror': True,
-                'showline': True,
-                'anchor': 'y',
-                'domain': [0.0, 1.0],
-                # 'showspikes': True,
-                # 'spikemode': 'across',
-                # 'spikesnap': 'cursor',
-            },
-            'xaxis2': {
-                'title': 'Channel',
-                'zeroline': False,
-                'linecolor': ' #626567',
-                'linewidth': 2,
-                'mirror': True,
-                'showline': True,
-                'anchor': 'y2',
-                'domain': [0.0, 1.0]
-            }
+    ntraces = len(real_traces)
+    fig.add_traces(real_traces + imag_traces, rows=[1] * ntraces + [2] * ntraces, cols=[1] * (2 * ntraces))
+
+    fig['layout'] = {
+        'height': height,
+        'width': width,
+        'title': 'Calibration Check: polarization={p}'.format(p=data.pol.values[pol_index]),
+        'paper_bgcolor': '#FFFFFF',
+        'plot_bgcolor': '#FFFFFF',
+        'font_color': '#323130',
+        'yaxis': {
+            'title': 'Visibilities (real)',
+            'linecolor': '#626567',
+            'linewidth': 2,
+            'zeroline': False,
+            'mirror': True,
+            'showline': True,
+            'anchor': 'x',
+            'domain': [0.575, 1.0],
+            # 'showspikes': True,
+            # 'spikemode': 'across',
+            # 'spikesnap': 'cursor',
+        },
+        'yaxis2': {
+            'title': 'Visibilities (imag)',
+            'linecolor': '#626567',
+            'linewidth': 2,
+            'zeroline': False,
+            'mirror': True,
+            'showline': True,
+            'anchor': 'x2',
+            'domain': [0.0, 0.425]
+        },
+        'xaxis': {
+            'title': 'Channel',
+            'zeroline': False,
+            'linecolor': ' #626567',
+            'linewidth': 2,
+            'mirror': True,
+            'showline': True,
+            'anchor': 'y',
+            'domain': [0.0, 1.0],
+            # 'showspikes': True,
+            # 'spikemode': 'across',
+            # 'spikesnap': 'cursor',
+        },
+        'xaxis2': {
+            'title': 'Channel',
+            'zeroline': False,
+            'linecolor': ' #626567',
+            'linewidth': 2,
+            'mirror': True,
+            'showline': True,
+            'anchor': 'y2',
+            'domain': [0.0, 1.0]
         }
+    }
 
     fig.show()
 
@@ -219,13 +206,14 @@ def _calibration_plot_chunk(param_dict):
 
     assert l_axis.shape[0] == m_axis.shape[0], "l, m dimensions don't match!"
 
-    indices = _extract_indices(l=l_axis, m=m_axis, squared_radius=radius)
+    mask = _extract_mask(l=l_axis, m=m_axis, squared_radius=radius)
+    vis = data.VIS.isel(time=mask)
 
     if complex_split == "cartesian":
         vis_dict = {
             "data": [
-                data.isel(time=indices).VIS.real,
-                data.isel(time=indices).VIS.imag
+                vis.real,
+                vis.imag
             ],
             "polarization": [0, 3],
             "label": ["REAL", "IMAG"]
@@ -233,8 +221,8 @@ def _calibration_plot_chunk(param_dict):
     else:
         vis_dict = {
             "data": [
-                data.isel(time=indices).apply(np.abs).VIS,
-                data.isel(time=indices).apply(np.angle).VIS
+                np.abs(vis),
+                vis.copy(data=np.angle(vis.values))
             ],
             "polarization": [0, 3],
             "label": ["AMP", "PHASE"]
@@ -6,6 +6,7 @@ import datetime
 import shutil
 import inspect
 import pathlib
+import functools
 
 import numpy as np
 import xarray as xr
@@ -62,23 +63,15 @@ def _load_panel_file(file=None, panel_dict=None, dask_load=True):
     if panel_dict is not None:
         panel_data_dict = panel_dict
 
-    ant_list = [dir_name for dir_name in os.listdir(file) if os.path.isdir(file)]
-
     try:
-        for ant in ant_list:
-            if 'ant' in ant:
-                ddi_list = [dir_name for dir_name in os.listdir(file + "/" + str(ant)) if
-                            os.path.isdir(file + "/" + str(ant))]
-                panel_data_dict[ant] = {}
-
-                for ddi in ddi_list:
-                    if 'ddi' in ddi:
-                        if dask_load:
-                            panel_data_dict[ant][ddi] = xr.open_zarr(
-                                "{name}/{ant}/{ddi}".format(name=file, ant=ant, ddi=ddi))
-                        else:
-                            panel_data_dict[ant][ddi] = _open_no_dask_zarr(
-                                "{name}/{ant}/{ddi}".format(name=file, ant=ant, ddi=ddi))
+        for ant, ant_path in _list_sub_directories(file, 'ant'):
+            panel_data_dict[ant] = {}
+
+            for ddi, ddi_path in _list_sub_directories(ant_path, 'ddi'):
+                if dask_load:
+                    panel_data_dict[ant][ddi] = xr.open_zarr(ddi_path)
+                else:
+                    panel_data_dict[ant][ddi] = _open_no_dask_zarr(ddi_path)
 
     except Exception as e:
         logger.error(str(e))
@@ -101,23 +94,15 @@ def _load_image_file(file=None, image_dict=None, dask_load=True):
     if image_dict is not None:
         ant_data_dict = image_dict
 
-    ant_list = [dir_name for dir_name in os.listdir(file) if os.path.isdir(file)]
-
     try:
-        for ant in ant_list:
-            if 'ant' in ant:
-                ddi_list = [dir_name for dir_name in os.listdir(file + "/" + str(ant)) if
-                            os.path.isdir(file + "/" + str(ant))]
-                ant_data_dict[ant] = {}
+        for ant, ant_path in _list_sub_directories(file, 'ant'):
+            ant_data_dict[ant] = {}
 
-                for ddi in ddi_list:
-                    if 'ddi' in ddi:
-                        if dask_load:
-                            ant_data_dict[ant][ddi] = xr.open_zarr(
-                                "{name}/{ant}/{ddi}".format(name=file, ant=ant, ddi=ddi))
-                        else:
-                            ant_data_dict[ant][ddi] = _open_no_dask_zarr(
-                                "{name}/{ant}/{ddi}".format(name=file, ant=ant, ddi=ddi))
+            for ddi, ddi_path in _list_sub_directories(ant_path, 'ddi'):
+                if dask_load:
+                    ant_data_dict[ant][ddi] = xr.open_zarr(ddi_path)
+                else:
+                    ant_data_dict[ant][ddi] = _open_no_dask_zarr(ddi_path)
 
     except Exception as e:
         logger.error(str(e))
@@ -142,25 +127,17 @@ def _load_locit_file(file=None, locit_dict=None, dask_load=True):
     if locit_dict is not None:
         ant_data_dict = locit_dict
 
-    ant_list = [dir_name for dir_name in os.listdir(file) if os.path.isdir(file)]
-
     ant_data_dict['obs_info'] = _read_meta_data(f'{file}/.observation_info')
     ant_data_dict['ant_info'] = {}
     try:
-        for ant in ant_list:
-            if 'ant' in ant:
-                ddi_list = [dir_name for dir_name in os.listdir(file + "/" + str(ant)) if
-                            os.path.isdir(file + "/" + str(ant))]
-                ant_data_dict[ant] = {}
-                ant_data_dict['ant_info'][ant] = _read_meta_data(f'{file}/{ant}/.antenna_info')
-                for ddi in ddi_list:
-                    if 'ddi' in ddi:
-                        if dask_load:
-                            ant_data_dict[ant][ddi] = xr.open_zarr(
-                                "{name}/{ant}/{ddi}".format(name=file, ant=ant, ddi=ddi))
-                        else:
-                            ant_data_dict[ant][ddi] = _open_no_dask_zarr(
-                                "{name}/{ant}/{ddi}".format(name=file, ant=ant, ddi=ddi))
+        for ant, ant_path in _list_sub_directories(file, 'ant'):
+            ant_data_dict[ant] = {}
+            ant_data_dict['ant_info'][ant] = _read_meta_data(f'{ant_path}/.antenna_info')
+            for ddi, ddi_path in _list_sub_directories(ant_path, 'ddi'):
+                if dask_load:
+                    ant_data_dict[ant][ddi] = xr.open_zarr(ddi_path)
+                else:
+                    ant_data_dict[ant][ddi] = _open_no_dask_zarr(ddi_path)
     except Exception as e:
         logger.error(str(e))
         raise
@@ -183,30 +160,21 @@ def _load_position_file(file=None, position_dict=None, dask_load=True, combine=F
     if position_dict is not None:
         ant_data_dict = position_dict
 
-    ant_list = [dir_name for dir_name in os.listdir(file) if os.path.isdir(file)]
-
     try:
         if combine:
-            for ant in ant_list:
-                if 'ant' in ant:
+            for ant, ant_path in _list_sub_directories(file, 'ant'):
+                if dask_load:
+                    ant_data_dict[ant] = xr.open_zarr(ant_path)
+                else:
+                    ant_data_dict[ant] = _open_no_dask_zarr(ant_path)
+        else:
+            for ant, ant_path in _list_sub_directories(file, 'ant'):
+                ant_data_dict[ant] = {}
+                for ddi, ddi_path in _list_sub_directories(ant_path, 'ddi'):
                     if dask_load:
-                        ant_data_dict[ant] = xr.open_zarr(f'{file}/{ant}')
+                        ant_data_dict[ant][ddi] = xr.open_zarr(ddi_path)
                     else:
-                        ant_data_dict[ant] = _open_no_dask_zarr(f'{file}/{ant}')
-        else:
-            for ant in ant_list:
-                if 'ant' in ant:
-                    ddi_list = [dir_name for dir_name in os.listdir(file + "/" + str(ant)) if
-                                os.path.isdir(file + "/" + str(ant))]
-                    ant_data_dict[ant] = {}
-                    for ddi in ddi_list:
-                        if 'ddi' in ddi:
-                            if dask_load:
-                                ant_data_dict[ant][ddi] = xr.open_zarr(
-                                    "{name}/{ant}/{ddi}".format(name=file, ant=ant, ddi=ddi))
-                            else:
-                                ant_data_dict[ant][ddi] = _open_no_dask_zarr(
-                                    "{name}/{ant}/{ddi}".format(name=file, ant=ant, ddi=ddi))
+                        ant_data_dict[ant][ddi] = _open_no_dask_zarr(ddi_path)
     except Exception as e:
         logger.error(str(e))
         raise
@@ -214,6 +182,20 @@ def _load_position_file(file=None, position_dict=None, dask_load=True, combine=F
     return ant_data_dict
 
 
+def _list_sub_directories(path, tag):
+    """List the sub directories of path whose names contain tag
+
+    Args:
+        path (str): Directory to be scanned
+        tag (str): Substring identifying the wanted sub directories, e.g. "ddi_"
+
+    Returns:
+        list: (name, path) tuples for the matching sub directories, in directory order
+    """
+    with os.scandir(path) as entries:
+        return [(entry.name, entry.path) for entry in entries if tag in entry.name and entry.is_dir()]
+
+
 def _load_holog_file(holog_file, dask_load=True, load_pnt_dict=True, ant_id=None, ddi_id=None, holog_dict=None):
     """Loads holog file from disk
 
@@ -231,38 +213,29 @@ def _load_holog_file(holog_file, dask_load=True, load_pnt_dict=True, ant_id=None
 
     if load_pnt_dict:
         logger.info("Loading pointing dictionary to holog ...")
-        holog_dict["pnt_dict"] = _load_point_file(file=holog_file, ant_list=None, dask_load=dask_load)
-
-    for ddi in os.listdir(holog_file):
-        if "ddi_" in ddi:
-
-            if ddi_id is None:
-                if ddi not in holog_dict:
-                    holog_dict[ddi] = {}
+        # Only the selected antenna's pointing is needed when an antenna is given
+        pnt_ant_list = None if ant_id is None else [ant_id]
+        holog_dict["pnt_dict"] = _load_point_file(file=holog_file, ant_list=pnt_ant_list, dask_load=dask_load)
+
+    for ddi, ddi_path in _list_sub_directories(holog_file, "ddi_"):
+        if ddi_id is None:
+            if ddi not in holog_dict:
+                holog_dict[ddi] = {}
+        else:
+            if ddi == ddi_id:
+                holog_dict[ddi] = {}
             else:
-                if ddi == ddi_id:
-                    holog_dict[ddi] = {}
-                else:
-                    continue
+                continue
 
-            for holog_map in os.listdir(os.path.join(holog_file, ddi)):
-                if "map_" in holog_map:
-                    if holog_map not in holog_dict[ddi]:
-                        holog_dict[ddi][holog_map] = {}
-                    for ant in os.listdir(os.path.join(holog_file, ddi + "/" + holog_map)):
-                        if "ant_" in ant:
-                            if (ant_id is None) or (ant_id in ant):
-                                mapping_ant_vis_holog_data_name = os.path.join(
-                                    holog_file, ddi + "/" + holog_map + "/" + ant
-                                )
-
-                                if dask_load:
-                                    holog_dict[ddi][holog_map][ant] = xr.open_zarr(
-                                        mapping_ant_vis_holog_data_name
-                                    )
-                                else:
-                                    holog_dict[ddi][holog_map][ant] = _open_no_dask_zarr(
-                                        mapping_ant_vis_holog_data_name)
+        for holog_map, map_path in _list_sub_directories(ddi_path, "map_"):
+            if holog_map not in holog_dict[ddi]:
+                holog_dict[ddi][holog_map] = {}
+            for ant, mapping_ant_vis_holog_data_name in _list_sub_directories(map_path, "ant_"):
+                if (ant_id is None) or (ant_id in ant):
+                    if dask_load:
+                        holog_dict[ddi][holog_map][ant] = xr.open_zarr(mapping_ant_vis_holog_data_name)
+                    else:
+                        holog_dict[ddi][holog_map][ant] = _open_no_dask_zarr(mapping_ant_vis_holog_data_name)
 
     if ant_id is None:
         return holog_dict
@@ -401,11 +374,12 @@ def _get_aips_headpars(head):
     npoint = np.nan
     wavelength = np.nan
     for line in head["HISTORY"]:
-        wrds = line.split()
-        if wrds[1] == "Visibilities":
-            npoint = np.sqrt(int(wrds[-1]))
-        elif wrds[1] == "Observing":
-            wavelength = float(wrds[-2])
+        # Only the second word and the last words of a line are of interest, so avoid splitting the whole line
+        keyword = line.split(None, 2)[1]
+        if keyword == "Visibilities":
+            npoint = np.sqrt(int(line.rsplit(None, 1)[-1]))
+        elif keyword == "Observing":
+            wavelength = float(line.rsplit(None, 2)[-2])
     return npoint, wavelength
 
 
@@ -465,14 +439,12 @@ def _write_meta_data(file_name, input_dict):
         input_dict: Dictionary to be included in the metadata
     """
 
-    calling_function = 1
-    
-
     meta_data = copy.deepcopy(input_dict)
 
+    # Only the caller's frame is needed, inspect.stack() would also read the source context of every frame.
     meta_data.update({
         'version': code_version,
-        'origin': inspect.stack()[calling_function].function
+        'origin': inspect.currentframe().f_back.f_code.co_name
     })
 
     try:
@@ -483,6 +455,21 @@ def _write_meta_data(file_name, input_dict):
         logger.error(f'{error}')
 
 
+@functools.lru_cache(maxsize=32)
+def _read_holog_json(holog_json_file, mtime_ns):
+    """Read holog json file, cached so that holog chunks in the same process parse it only once.
+
+    Args:
+        holog_json_file (str): .holog_json file name.
+        mtime_ns (int): File modification time, part of the cache key so that a rewritten file is read again.
+
+    Returns:
+        dict: holog json contents, shared between callers, not to be modified.
+    """
+    with open(holog_json_file, "r") as json_file:
+        return json.load(json_file)
+
+
 def _read_data_from_holog_json(holog_file, holog_dict, ant_id, ddi_id=None):
     """Read holog file meta data and extract antenna based xds information for each (ddi, holog_map)
 
@@ -500,8 +487,7 @@ def _read_data_from_holog_json(holog_file, holog_dict, ant_id, ddi_id=None):
     holog_meta_data = str(pathlib.Path(holog_file).joinpath(".holog_json"))
 
     try:
-        with open(holog_meta_data, "r") as json_file:
-            holog_json = json.load(json_file)
+        holog_json = _read_holog_json(holog_meta_data, os.stat(holog_meta_data).st_mtime_ns)
 
     except Exception as error:
         logger.error(str(error))
@@ -582,13 +568,12 @@ def _load_point_file(file, ant_list=None, dask_load=True, pnt_dict=None, diagnos
 
     pnt_dict['point_meta_ds'] = xr.open_zarr(file)
 
-    for ant in os.listdir(file):
-        if "ant_" in ant:
-            if (ant_list is None) or (ant in ant_list):
-                if dask_load:
-                    pnt_dict[ant] = xr.open_zarr(os.path.join(file, ant))
-                else:
-                    pnt_dict[ant] = _open_no_dask_zarr(os.path.join(file, ant))
+    for ant, ant_path in _list_sub_directories(file, "ant_"):
+        if (ant_list is None) or (ant in ant_list):
+            if dask_load:
+                pnt_dict[ant] = xr.open_zarr(ant_path)
+            else:
+                pnt_dict[ant] = _open_no_dask_zarr(ant_path)
 
     if diagnostic:
         _check_time_axis_consistency(pnt_dict)
@@ -30,6 +30,10 @@ def _extract_holog_chunk(extract_holog_params):
         map_ant_ids (numpy.narray): Array of antenna_id values corresponding to mapping data.
         ref_ant_ids (numpy.narray): Arry of antenna_id values corresponding to reference data.
         sel_state_ids (list): List pf state_ids corresponding to holography data/
+
+    Returns:
+        tuple: ddi key, holog map key and the description of the written antenna xdses, as returned by
+        _create_holog_file
     """
 
     ms_name = extract_holog_params["ms_name"]
@@ -132,7 +136,7 @@ def _extract_holog_chunk(extract_holog_params):
     # vis_map_dict, weight_map_dict, flagged_mapping_antennas,time_vis,pnt_map_dict,ant_names) time_vis = time_vis +
     # over_flow_protector_constant
 
-    _create_holog_file(
+    holog_xds_dict = _create_holog_file(
         holog_name,
         vis_map_dict,
         weight_map_dict,
@@ -154,6 +158,8 @@ def _extract_holog_chunk(extract_holog_params):
         ddi=ddi, holog_map_key=holog_map_key)
     )
 
+    return 'ddi_' + str(ddi), holog_map_key, holog_xds_dict
+
 
 @njit(cache=False, nogil=True)
 def _get_time_intervals(time_vis_row, scan_list, time_interval):
@@ -360,8 +366,13 @@ def _create_holog_file(
         flagged_mapping_antennas (numpy.ndarray): list of mapping antennas that have been flagged.
         holog_map_key(string): holog map id string
         ddi (numpy.ndarray): data description id; a combination of polarization and spectral window
+
+    Returns:
+        dict: xds description (xds.to_dict(data=False)) of each written antenna, keyed by antenna
     """
 
+    holog_xds_dict = {}
+
     ctb = ctables.table("/".join((ms_name, "ANTENNA")))
     observing_location = ctb.getcol("POSITION")
 
@@ -437,9 +448,13 @@ def _create_holog_file(
                 consolidated=True,
             )
 
+            holog_xds_dict["ant_" + str(ant_names[map_ant_index])] = xds.to_dict(data=False)
+
         else:
             logger.warning("Mapping antenna {index} has no data".format(index=ant_names[map_ant_index]))
 
+    return holog_xds_dict
+
 
 def _create_holog_obs_dict(
         pnt_dict,
@@ -642,7 +657,7 @@ def _create_holog_meta_data(holog_file, holog_dict, input_params):
 
     Args:
         holog_name (str): holog file name.
-        holog_dict (dict): Dictionary containing msdx data.
+        holog_dict (dict): Nested dictionary (ddi, holog_map, ant) of xds descriptions (xds.to_dict(data=False)).
     """
 
     ant_holog_dict = {}
@@ -654,18 +669,18 @@ def _create_holog_meta_data(holog_file, holog_dict, input_params):
         if "ddi_" in ddi:
             for mapping, ant_dict in map_dict.items():
                 if "map_" in mapping:
-                    for ant, xds in ant_dict.items():
+                    for ant, xds_dict in ant_dict.items():
                         if "ant_" in ant:
                             if ant not in ant_holog_dict:
                                 ant_holog_dict[ant] = {ddi: {mapping: {}}}
                             elif ddi not in ant_holog_dict[ant]:
                                 ant_holog_dict[ant][ddi] = {mapping: {}}
 
-                            ant_holog_dict[ant][ddi][mapping] = xds.to_dict(data=False)
+                            ant_holog_dict[ant][ddi][mapping] = xds_dict
 
-                            cell_sizes.append(xds.attrs["grid_params"]["cell_size"])
-                            n_pixs.append(xds.attrs["grid_params"]["n_pix"])
-                            telescope_names.append(xds.attrs['telescope_name'])
+                            cell_sizes.append(xds_dict["attrs"]["grid_params"]["cell_size"])
+                            n_pixs.append(xds_dict["attrs"]["grid_params"]["n_pix"])
+                            telescope_names.append(xds_dict["attrs"]['telescope_name'])
 
     cell_sizes_sigfigs = _significant_digits(cell_sizes, digits=3)
 
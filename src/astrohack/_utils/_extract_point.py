@@ -5,14 +5,10 @@ import numpy as np
 import graphviper.utils.logger as logger
 import xarray as xr
 
-from astrohack._utils._conversion import convert_dict_from_numba
 from astrohack._utils._dio import _load_point_file
 from astrohack._utils._tools import _get_valid_state_ids
 from casacore import tables as ctables
 from numba import njit
-from numba.core import types
-from numba.typed import Dict
-from scipy import spatial
 
 
 def _extract_pointing(ms_name, pnt_name, exclude, parallel=True):
@@ -90,75 +86,97 @@ def _extract_pointing(ms_name, pnt_name, exclude, parallel=True):
         'scan_time_dict': scan_time_dict
     }
 
-    if parallel:
-        delayed_pnt_list = []
-        for i_ant in range(len(antenna_id)):
-            pnt_params['ant_id'] = antenna_id[i_ant]
-            pnt_params['ant_name'] = antenna_name[i_ant]
+    # Read the POINTING table once and hand each antenna its own block of rows, instead of scanning the whole table
+    # for every antenna.
+    pnt_columns, pnt_ant_ids = _read_pointing_table(ms_name)
+    row_starts = np.searchsorted(pnt_ant_ids, antenna_id, side='left')
+    row_stops = np.searchsorted(pnt_ant_ids, antenna_id, side='right')
 
-            delayed_pnt_list.append(
-                dask.delayed(_make_ant_pnt_chunk)(
-                    ms_name,
-                    pnt_params
-                )
-            )
+    # Each antenna gets its own parameter dictionary so that chunks are independent of each other.
+    delayed_write_list = []
+    for i_ant in range(len(antenna_id)):
+        if row_starts[i_ant] == row_stops[i_ant]:
+            logger.warning("Skipping antenna " + str(antenna_id[i_ant]) + " no pointing info")
+            continue
 
-        dask.compute(delayed_pnt_list)
+        ant_pnt_params = pnt_params.copy()
+        ant_pnt_params['ant_name'] = antenna_name[i_ant]
+        ant_pnt_params['pointing'] = {
+            column: values[row_starts[i_ant]:row_stops[i_ant]] for column, values in pnt_columns.items()
+        }
 
-    else:
-        for i_ant in range(len(antenna_id)):
-            pnt_params['ant_id'] = antenna_id[i_ant]
-            pnt_params['ant_name'] = antenna_name[i_ant]
+        delayed_write_list.append(_make_ant_pnt_chunk(ant_pnt_params))
+
+    # The zarr writes of all antennas are submitted together so that dask can overlap their encoding and I/O.
+    if parallel:
+        dask.compute(delayed_write_list)
 
-            _make_ant_pnt_chunk(ms_name, pnt_params)
+    else:
+        dask.compute(delayed_write_list, scheduler='synchronous')
 
     return _load_point_file(pnt_name, diagnostic=True)
 
 
-def _make_ant_pnt_chunk(ms_name, pnt_params):
-    """Extract subset of pointing table data into a dictionary of xarray data arrays. This is written to disk as a
-    zarr file. This function processes a chunk the overall data and is managed by Dask.
+def _read_pointing_table(ms_name):
+    """Read the columns needed for pointing extraction from the POINTING table in a single pass, with the rows grouped
+    by antenna.
 
     Args:
         ms_name (str): Measurement file name.
-        ant_id (int): Antenna id
-        pnt_name (str): Name of output pointing dictionary file name.
-    """
-
-    ant_id = pnt_params['ant_id']
-    ant_name = pnt_params['ant_name']
-    pnt_name = pnt_params['pnt_name']
-    scan_time_dict = pnt_params['scan_time_dict']
 
-    table_obj = ctables.table(
+    Returns:
+        dict: POINTING columns with rows grouped by antenna and in table order within each antenna
+        numpy.ndarray: Sorted antenna id of each row
+    """
+    ctb = ctables.table(
         os.path.join(ms_name, "POINTING"),
         readonly=True,
-        lockoptions={
-            'option': 'usernoread'
-        }, ack=False
-    )
-
-    tb = ctables.taql(
-        "select DIRECTION, TIME, TARGET, ENCODER, ANTENNA_ID, POINTING_OFFSET from $table_obj WHERE ANTENNA_ID == %s"
-        % (ant_id)
+        lockoptions={"option": "usernoread"},
+        ack=False,
     )
 
     # NB: Add check if directions reference frame is Azemuth Elevation (AZELGEO)
-    try:
-        direction = tb.getcol("DIRECTION")[:, 0, :]
-        target = tb.getcol("TARGET")[:, 0, :]
-        encoder = tb.getcol("ENCODER")
-        direction_time = tb.getcol("TIME")
-        pointing_offset = tb.getcol("POINTING_OFFSET")[:, 0, :]
+    # Only the zeroth polynomial term of the direction columns is used, so only that slice is read from disk.
+    pnt_ant_ids = ctb.getcol("ANTENNA_ID")
+    pnt_columns = {
+        "DIRECTION": ctb.getcolslice("DIRECTION", blc=[0, 0], trc=[0, 1])[:, 0, :],
+        "TARGET": ctb.getcolslice("TARGET", blc=[0, 0], trc=[0, 1])[:, 0, :],
+        "ENCODER": ctb.getcol("ENCODER"),
+        "TIME": ctb.getcol("TIME"),
+        "POINTING_OFFSET": ctb.getcolslice("POINTING_OFFSET", blc=[0, 0], trc=[0, 1])[:, 0, :]
+    }
+    ctb.close()
+
+    # A stable sort keeps the rows of each antenna in time order.
+    ant_order = np.argsort(pnt_ant_ids, kind='stable')
+    for column, values in pnt_columns.items():
+        pnt_columns[column] = values[ant_order]
+
+    return pnt_columns, pnt_ant_ids[ant_order]
+
+
+def _make_ant_pnt_chunk(pnt_params):
+    """Extract subset of pointing table data into a dictionary of xarray data arrays. This is written to disk as a
+    zarr file. This function processes a chunk the overall data, the write itself is deferred to Dask.
+
+    Args:
+        pnt_params (dict): Antenna name, output pointing dictionary file name, scan time dictionary and the
+                           antenna's rows of the POINTING table.
 
-    except Exception:
-        tb.close()
-        logger.warning("Skipping antenna " + str(ant_id) + " no pointing info")
+    Returns:
+        dask.delayed.Delayed: Deferred zarr write of the antenna's pointing xds
+    """
 
-        return 0
+    ant_name = pnt_params['ant_name']
+    pnt_name = pnt_params['pnt_name']
+    scan_time_dict = pnt_params['scan_time_dict']
+    pointing = pnt_params['pointing']
 
-    tb.close()
-    table_obj.close()
+    direction = pointing["DIRECTION"]
+    target = pointing["TARGET"]
+    encoder = pointing["ENCODER"]
+    direction_time = pointing["TIME"]
+    pointing_offset = pointing["POINTING_OFFSET"]
 
     pnt_xds = xr.Dataset()
     coords = {"time": direction_time}
@@ -187,12 +205,8 @@ def _make_ant_pnt_chunk(ms_name, pnt_params):
 
     # ## NB: Is VLA's definition of Azimuth the same for ALMA, MeerKAT, etc.? (positive for a clockwise rotation from
     # north, viewed from above) ## NB: Compare with calculation using WCS in astropy.
-    l = np.cos(target[:, 1]) * np.sin(target[:, 0] - direction[:, 0])
-    m = np.sin(target[:, 1]) * np.cos(direction[:, 1]) - np.cos(target[:, 1]) * np.sin(direction[:, 1]) * np.cos(
-        target[:, 0] - direction[:, 0])
-
     pnt_xds["DIRECTIONAL_COSINES"] = xr.DataArray(
-        np.array([l, m]).T, dims=("time", "lm")
+        _compute_directional_cosines(target, direction), dims=("time", "lm")
     )
 
     '''
@@ -229,24 +243,32 @@ def _make_ant_pnt_chunk(ms_name, pnt_params):
     From the above description I suspect encoder should be used instead of direction, however for the VLA mapping 
     antenna data no grid pattern appears (ALMA data does not have this problem).'''
 
-    # Detect during which scans an antenna is mapping by averaging the POINTING_OFFSET radius.
-    time_tree = spatial.KDTree(direction_time[:, None])  # Use for nearest interpolation
+    # Detect during which scans an antenna is mapping by averaging the POINTING_OFFSET radius. The radius is summed
+    # over all scans in a single reduction, using interleaved scan start and stop indices.
+    offset_radius = np.hypot(pointing_offset[:, 0], pointing_offset[:, 1])
+
+    scan_list = [(ddi_id, scan_id) for ddi_id, ddi in scan_time_dict.items() for scan_id in ddi.keys()]
+    is_mapping = np.zeros(len(scan_list), dtype=bool)
+
+    if len(scan_list) > 0:
+        scan_time = np.array([scan_time_dict[ddi_id][scan_id] for ddi_id, scan_id in scan_list])
+        time_index = _nearest_time_index(direction_time, scan_time.ravel())
+
+        scan_length = time_index[1::2] - time_index[0::2]
+        scan_radius = np.add.reduceat(offset_radius, time_index)[0::2] / np.maximum(scan_length, 1)
+
+        # Antenna is mapping since lm is non-zero
+        is_mapping = (scan_length > 0) & (scan_radius > 10 ** -12)
 
     mapping_scans_obs_dict = {}
+    i_scan = 0
 
     for ddi_id, ddi in scan_time_dict.items():
         map_scans_dict = {}
         map_id = 0
 
-        for scan_id, scan_time in ddi.items():
-            _, time_index = time_tree.query(scan_time[:, None])
-
-            pointing_offset_scan_slice = pnt_xds["POINTING_OFFSET"].isel(time=slice(time_index[0], time_index[1]))
-
-            r = (np.sqrt(
-                pointing_offset_scan_slice.isel(az_el=0) ** 2 + pointing_offset_scan_slice.isel(az_el=1) ** 2)).mean()
-
-            if r > 10 ** -12:  # Antenna is mapping since lm is non-zero
+        for scan_id in ddi.keys():
+            if is_mapping[i_scan]:
                 if ('map_' + str(map_id)) in map_scans_dict:
                     map_scans_dict['map_' + str(map_id)].append(scan_id)
 
@@ -256,6 +278,8 @@ def _make_ant_pnt_chunk(ms_name, pnt_params):
             else:
                 map_id = map_id + 1
 
+            i_scan += 1
+
         mapping_scans_obs_dict['ddi_' + str(ddi_id)] = map_scans_dict
 
     pnt_xds.attrs['mapping_scans_obs_dict'] = [mapping_scans_obs_dict]
@@ -263,83 +287,107 @@ def _make_ant_pnt_chunk(ms_name, pnt_params):
 
     pnt_xds.attrs['ant_name'] = pnt_params['ant_name']
 
-    logger.debug(
-        "Writing pointing xds to {file}".format(
-            file=os.path.join(pnt_name, "ant_" + str(ant_name))
-        )
-    )
-
-    pnt_xds.to_zarr(os.path.join(pnt_name, "ant_{}".format(str(ant_name))), mode="w", compute=True, consolidated=True)
-
+    ant_pnt_name = os.path.join(pnt_name, "ant_" + str(ant_name))
+    logger.debug("Writing pointing xds to {file}".format(file=ant_pnt_name))
 
-def _extract_scan_time_dict(time, scan_ids, state_ids, ddi_ids, mapping_state_ids):
-    '''
-        [ddi][scan][start, stop]
-    '''
-    scan_time_dict = _extract_scan_time_dict_jit(time, scan_ids, state_ids, ddi_ids, mapping_state_ids)
+    return pnt_xds.chunk().to_zarr(ant_pnt_name, mode="w", compute=False, consolidated=True)
 
-    # This section cleans up the case of when there was an issue with the scan time data. If the scan start and end 
-    # times are the same the mapping(reference) state identification does not work. For this reason, scans containing 
-    # instance of this are removed and any empty ddi(s) are dropped as well.
-    drops = {}
 
-    for ddi in scan_time_dict.keys():
-        drops[ddi] = []
+def _nearest_time_index(time, query_time):
+    """Find the index of the nearest sample in a monotonically increasing time axis for each query time.
 
-        for scan in scan_time_dict[ddi].keys():
-            if scan_time_dict[ddi][scan][0] == scan_time_dict[ddi][scan][1]:
-                drops[ddi].append(scan)
+    Args:
+        time (numpy.ndarray): Sorted time axis
+        query_time (numpy.ndarray): Times to look up
 
-    for ddi, scans in drops.items():
-        for scan in scans:
-            del scan_time_dict[ddi][scan]
+    Returns:
+        numpy.ndarray: Index of the nearest sample in time for each query time
+    """
+    if time.shape[0] == 1:
+        return np.zeros(query_time.shape, dtype=int)
 
-        if len(scan_time_dict[ddi]) == 0:
-            del scan_time_dict[ddi]
+    index = np.clip(np.searchsorted(time, query_time), 1, time.shape[0] - 1)
+    index -= query_time - time[index - 1] <= time[index] - query_time
 
-    return scan_time_dict
+    return index
 
 
-@convert_dict_from_numba
 @njit(cache=False, nogil=True)
-def _extract_scan_time_dict_jit(time, scan_ids, state_ids, ddi_ids, mapping_state_ids):
-    """For each ddi get holography scan start and end times. A holography scan is detected when a scan_ids appears in 
-    mapping_state_ids.
+def _compute_directional_cosines(target, direction):
+    """Compute the directional cosines (l, m) of the target relative to the antenna pointing direction in a single
+    pass over the time axis.
 
-    """
-    d1 = Dict.empty(
-        key_type=types.int64,
-        value_type=np.zeros(2, dtype=types.float64),
-    )
+    Args:
+        target (numpy.ndarray): Target azimuth and elevation, shape (time, 2)
+        direction (numpy.ndarray): Antenna pointing azimuth and elevation, shape (time, 2)
 
-    scan_time_dict = Dict.empty(
-        key_type=types.int64,
-        value_type=d1,
-    )
+    Returns:
+        numpy.ndarray: Directional cosines, shape (time, 2)
+    """
+    n_time = target.shape[0]
+    lm = np.empty((n_time, 2))
 
-    mapping_scans = set()
+    for i_time in range(n_time):
+        cos_target_el = np.cos(target[i_time, 1])
+        delta_az = target[i_time, 0] - direction[i_time, 0]
 
-    for i, s in enumerate(scan_ids):
-        s = types.int64(s)
-        t = time[i]
-        ddi = ddi_ids[i]
+        lm[i_time, 0] = cos_target_el * np.sin(delta_az)
+        lm[i_time, 1] = np.sin(target[i_time, 1]) * np.cos(direction[i_time, 1]) - \
+            cos_target_el * np.sin(direction[i_time, 1]) * np.cos(delta_az)
 
-        state_id = state_ids[i]
+    return lm
 
-        if state_id in mapping_state_ids:
-            mapping_scans.add(s)
-            if ddi in scan_time_dict:
-                if s in scan_time_dict[ddi]:
-                    if scan_time_dict[ddi][s][0] > t:
-                        scan_time_dict[ddi][s][0] = t
 
-                    if scan_time_dict[ddi][s][1] < t:
-                        scan_time_dict[ddi][s][1] = t
+def _extract_scan_time_dict(time, scan_ids, state_ids, ddi_ids, mapping_state_ids):
+    """For each ddi get holography scan start and end times. A holography scan is detected when its state id appears
+    in mapping_state_ids.
 
-                else:
-                    scan_time_dict[ddi][s] = np.array([t, t])
+    Args:
+        time (numpy.ndarray): Time of each row of the main table
+        scan_ids (numpy.ndarray): Scan number of each row of the main table
+        state_ids (numpy.ndarray): State id of each row of the main table
+        ddi_ids (numpy.ndarray): Data description id of each row of the main table
+        mapping_state_ids (numpy.ndarray): State ids used for mapping
 
-            else:
-                scan_time_dict[ddi] = {s: np.array([t, t])}
+    Returns:
+        dict: [ddi][scan][start, stop]
+    """
+    # Membership is looked up in a boolean table indexed by state id. STATE_ID is -1 for rows without a state, hence
+    # the offset of one.
+    n_states = max(np.max(state_ids, initial=-1), np.max(mapping_state_ids, initial=-1)) + 2
+    is_mapping_state = np.zeros(n_states, dtype=bool)
+    is_mapping_state[np.asarray(mapping_state_ids, dtype=int) + 1] = True
+    mapping_rows = is_mapping_state[state_ids + 1]
+    time = time[mapping_rows]
+    scan_ids = scan_ids[mapping_rows]
+    ddi_ids = ddi_ids[mapping_rows]
+
+    scan_time_dict = {}
+    if time.shape[0] == 0:
+        return scan_time_dict
+
+    # Group rows by (ddi, scan) with a single stable sort over a combined key, then reduce the time column over each
+    # group. Groups are visited in order of first appearance to keep the order of the main table.
+    scan_key = (ddi_ids.astype(np.int64) << 32) | scan_ids.astype(np.int64)
+    sort_index = np.argsort(scan_key, kind='stable')
+    sorted_key = scan_key[sort_index]
+    sorted_time = time[sort_index]
+
+    group_start = np.flatnonzero(np.concatenate(([True], sorted_key[1:] != sorted_key[:-1])))
+    start_time = np.minimum.reduceat(sorted_time, group_start)
+    stop_time = np.maximum.reduceat(sorted_time, group_start)
+    group_key = sorted_key[group_start]
+
+    for i_group in np.argsort(sort_index[group_start]):
+        ddi_scans = scan_time_dict.setdefault(int(group_key[i_group] >> 32), {})
+
+        # If the scan start and end times are the same the mapping(reference) state identification does not work.
+        # For this reason such scans are dropped.
+        if start_time[i_group] != stop_time[i_group]:
+            ddi_scans[int(group_key[i_group] & 0xFFFFFFFF)] = np.array([start_time[i_group], stop_time[i_group]])
+
+    # Any ddi(s) left without scans are dropped as well.
+    for ddi in [ddi for ddi, ddi_scans in scan_time_dict.items() if len(ddi_scans) == 0]:
+        del scan_time_dict[ddi]
 
     return scan_time_dict
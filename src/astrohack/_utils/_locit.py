@@ -423,11 +423,11 @@ def _build_filtered_arrays(field_id, time, delays, locit_parms):
 
     n_samples = len(field_id)
     coordinates = np.ndarray([4, n_samples])
-    for i_sample in range(n_samples):
-        field = str(field_id[i_sample])
-        coordinates[0:2, i_sample] = src_list[field][key]
-        coordinates[2, i_sample] = _hadec_to_elevation(src_list[field][key], antenna['latitude'])
-        coordinates[3, i_sample] = time[i_sample]-time[0]  # time is set to zero at the beginning of obs
+    unique_fields, field_index = np.unique(field_id, return_inverse=True)
+    field_coordinates = np.array([src_list[str(field)][key] for field in unique_fields])
+    coordinates[0:2, :] = field_coordinates[field_index].T
+    coordinates[2, :] = _hadec_to_elevation(coordinates[0:2, :], antenna['latitude'])
+    coordinates[3, :] = time-time[0]  # time is set to zero at the beginning of obs
 
     # convert to actual hour angle and wrap it to the [-pi, pi) interval
     coordinates[0, :] = lst.value - coordinates[0, :]
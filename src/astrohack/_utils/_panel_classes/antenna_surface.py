@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import xarray as xr
 
@@ -44,6 +46,9 @@ class AntennaSurface:
             self.panelmodel = pmodel
             self.panel_margins = panel_margins
             self.reso = self.telescope.diam / self.npoint
+            # Theoretical gain only depends on the resolution and wavelength
+            self._thgain = fourpi * (1000.0 * self.reso / self.wavelength) ** 2
+            self._thgain_db = _convert_to_db(self._thgain)
             if crop:
                 self._crop_maps()
 
@@ -168,6 +173,8 @@ class AntennaSurface:
         self.corrections = None
         self.phase_corrections = None
         self.phase_residuals = None
+        self.rad = None
+        self.phi = None
         self.solved = False
         self.ingains = np.nan
         self.ougains = np.nan
@@ -200,6 +207,7 @@ class AntennaSurface:
         else:
             raise Exception("Unknown panel labeling: "+self.telescope.panel_numbering)
         self._build_polar()
+        self._build_phase_to_deviation_factor()
         if not self.reread:
             self.clip = self._measure_ring_clip(clip_type, clip_level)
         self._build_ring_panels()
@@ -262,6 +270,18 @@ class AntennaSurface:
         if self.deviation is not None:
             self.deviation = self.deviation[iumin:iumax, ivmin:ivmax]
 
+    def _build_phase_to_deviation_factor(self):
+        """
+        Build the map of the factor that converts phase to physical deviation, it only depends on the aperture
+        coordinates, the wavelength and the telescope focus, hence it is computed only once.
+        The squared radius is computed from the axes in double precision rather than from the single precision polar
+        grid
+        """
+        acoeff = (self.wavelength / twopi) / (4.0 * self.telescope.focus)
+        bcoeff = 4 * self.telescope.focus ** 2
+        radsq = self.u_axis.reshape(self.unpix, 1)**2 + self.v_axis.reshape(1, self.vnpix)**2
+        self._phase_to_deviation_factor = acoeff * np.sqrt(radsq + bcoeff)
+
     def _phase_to_deviation(self, phase):
         """
         Transforms a phase map to a physical deviation map
@@ -271,9 +291,7 @@ class AntennaSurface:
         Returns:
             Physical deviation map
         """
-        acoeff = (self.wavelength / twopi) / (4.0 * self.telescope.focus)
-        bcoeff = 4 * self.telescope.focus ** 2
-        return acoeff * phase * np.sqrt(self.rad ** 2 + bcoeff)
+        return phase * self._phase_to_deviation_factor
 
     def _deviation_to_phase(self, deviation):
         """
@@ -284,20 +302,28 @@ class AntennaSurface:
         Returns:
             Phase map
         """
-        acoeff = (self.wavelength / twopi) / (4.0 * self.telescope.focus)
-        bcoeff = 4 * self.telescope.focus ** 2
-        return deviation / (acoeff * np.sqrt(self.rad ** 2 + bcoeff))
+        return deviation / self._phase_to_deviation_factor
 
     def _build_ring_mask(self):
         """
         Builds the mask on regions to be included in panel surface masks, specific to circular antennas as there is an
         outer and inner limit to the mask based on the antenna's inner receiver hole and outer edge
         """
-        self.mask = np.where(self.amplitude < self.clip, False, True)
-        self.mask = np.where(self.rad > self.telescope.inlim, self.mask, False)
-        self.mask = np.where(self.rad < self.telescope.oulim, self.mask, False)
-        self.mask = np.where(np.isnan(self.amplitude), False, self.mask)
-        self.mask = np.where(self.deviation != self.deviation, False, self.mask)
+        # NaN amplitudes fail the clip comparison, and the deviation self comparison is False only for NaNs (it is a
+        # scalar True when the deviation has not yet been computed from the phase)
+        self.mask = (self.amplitude >= self.clip) & (self.rad > self.telescope.inlim) & \
+                    (self.rad < self.telescope.oulim) & (self.deviation == self.deviation)
+
+    def _mask_indices(self):
+        """
+        Scans the current mask for its valid pixels, so that the computations over the masked pixels of a single call
+        share one scan of the mask. The mask is rescanned on every call as it can be replaced or changed in place
+
+        Returns:
+            Indices of the valid pixels in the mask and their count
+        """
+        mask_idx = np.nonzero(np.asarray(self.mask))
+        return mask_idx, mask_idx[0].size
 
     def _nan_out_of_bounds_ringed(self, data):
         """
@@ -315,12 +341,12 @@ class AntennaSurface:
     def _build_polar(self):
         """
         Build polar coordinate grid, specific for circular antennas with panels arranged in rings
+        The grid is only used for masking and assigning pixels to panels, hence single precision is enough for it
         """
-        u2d = self.u_axis.reshape(self.unpix, 1)
-        v2d = self.v_axis.reshape(1, self.vnpix)
-        self.rad = np.sqrt(u2d**2 + v2d**2)
-        self.phi = np.arctan2(u2d, -v2d)-pi/2
-        self.phi = np.where(self.phi < 0, self.phi+twopi, self.phi)
+        u2d = self.u_axis.astype(np.float32).reshape(self.unpix, 1)
+        v2d = self.v_axis.astype(np.float32).reshape(1, self.vnpix)
+        self.rad = np.hypot(u2d, v2d)
+        self.phi = np.mod(np.arctan2(u2d, -v2d)-np.float32(pi/2), np.float32(twopi))
 
     def _build_ring_panels(self):
         """
@@ -344,9 +370,13 @@ class AntennaSurface:
                     plot_screw_size=0.006 * self.telescope.diam
                 )
                 self.panels.append(panel)
+        # Index of the first panel of each ring in the panel list
+        self._ring_offsets = np.concatenate([[0], np.cumsum(self.telescope.npanel)]).astype(int)
         return
 
     def _compile_panel_points_ringed(self):
+        if self.rad is None:
+            self._build_polar()
         panels = np.zeros(self.rad.shape)
         panelsum = 0
         for iring in range(self.telescope.nrings):
@@ -354,20 +384,26 @@ class AntennaSurface:
             panels = np.where(self.rad >= self.telescope.inrad[iring], np.floor(self.phi/angle) + panelsum, panels)
             panelsum += self.telescope.npanel[iring]
         panels = np.where(self.mask, panels, -1).astype("int32")
-        for ix in range(self.unpix):
-            xc = self.u_axis[ix]
-            for iy in range(self.vnpix):
-                ipanel = panels[ix, iy]
-                if ipanel >= 0:
-                    yc = self.v_axis[iy]
-                    panel = self.panels[ipanel]
-                    issample, inpanel = panel.is_inside(self.rad[ix, iy], self.phi[ix, iy])
-                    if inpanel:
-                        if issample:
-                            panel.add_sample([xc, yc, ix, iy, self.deviation[ix, iy]])
-                        else:
-                            panel.add_margin([xc, yc, ix, iy, self.deviation[ix, iy]])
+
+        # Gather all valid pixels at once and group them by panel, a stable sort keeps the pixels of each panel in the
+        # same row-major order they would have in a loop over the image
+        ix, iy = np.nonzero(panels >= 0)
+        ipanels = panels[ix, iy]
+        points = np.column_stack([self.u_axis[ix], self.v_axis[iy], ix, iy, self.deviation[ix, iy]])
+        rad = self.rad[ix, iy]
+        phi = self.phi[ix, iy]
+        order = np.argsort(ipanels, kind='stable')
+        bounds = np.searchsorted(ipanels[order], np.arange(len(self.panels)+1))
+        for ipanel, panel in enumerate(self.panels):
+            selection = order[bounds[ipanel]:bounds[ipanel+1]]
+            issample, inpanel = panel.is_inside(rad[selection], phi[selection])
+            panel.add_samples(points[selection[inpanel & issample]])
+            panel.add_margins(points[selection[inpanel & ~issample]])
         self.panel_distribution = panels
+        # The polar grid is not needed after the panel points are compiled, release it to reduce the memory footprint
+        # of fitting and plotting
+        self.rad = None
+        self.phi = None
 
     def _fetch_panel_ringed(self, ring, panel):
         """
@@ -380,11 +416,7 @@ class AntennaSurface:
         Returns:
         Panel object
         """
-        if ring == 1:
-            ipanel = panel - 1
-        else:
-            ipanel = np.sum(self.telescope.npanel[: ring - 1]) + panel - 1
-        return self.panels[ipanel]
+        return self.panels[self._ring_offsets[ring-1] + panel - 1]
 
     def gains(self):
         """
@@ -392,26 +424,28 @@ class AntennaSurface:
         Returns:
         Gains before panel fitting OR Gains before and after panel fitting
         """
-        self.ingains = self._gains_array(self.phase)
+        mask_idx, mask_count = self._mask_indices()
+        self.ingains = self._gains_array(self.phase, mask_idx, mask_count)
         if self.residuals is None:
             return self.ingains
         else:
-            self.ougains = self._gains_array(self.phase_residuals)
+            self.ougains = self._gains_array(self.phase_residuals, mask_idx, mask_count)
             return self.ingains, self.ougains
 
-    def _gains_array(self, arr):
+    def _gains_array(self, arr, mask_idx, mask_count):
         """
         Worker for gains method, works with the actual arrays to compute the gains
         This numpy version is significantly faster than the previous version
         Args:
             arr: Deviation image over which to compute the gains
+            mask_idx: Indices of the valid pixels in the mask
+            mask_count: Number of valid pixels in the mask
 
         Returns:
         Actual and theoretical gains
         """
-        thgain = fourpi * (1000.0 * self.reso / self.wavelength) ** 2
-        gain = thgain * np.sqrt(np.sum(np.cos(arr[self.mask]))**2 + np.sum(np.sin(arr[self.mask]))**2)/np.sum(self.mask)
-        return _convert_to_db(gain), _convert_to_db(thgain)
+        gain = self._thgain * np.abs(np.exp(1j*arr[mask_idx]).sum())/mask_count
+        return _convert_to_db(gain), self._thgain_db
 
     def get_rms(self, unit='mm'):
         """
@@ -420,32 +454,46 @@ class AntennaSurface:
         RMS before panel fitting OR RMS before and after panel fitting
         """
         fac = _convert_unit('m', unit, 'length')
-        self.in_rms = self._compute_rms_array(self.deviation)
+        mask_idx, mask_count = self._mask_indices()
+        self.in_rms = self._compute_rms_array(self.deviation, mask_idx, mask_count)
         if self.residuals is None:
             return fac*self.in_rms
         else:
-            self.out_rms = self._compute_rms_array(self.residuals)
+            self.out_rms = self._compute_rms_array(self.residuals, mask_idx, mask_count)
         return fac*self.in_rms, fac*self.out_rms
 
-    def _compute_rms_array(self, array):
+    def _compute_rms_array(self, array, mask_idx, mask_count):
         """
         Factorized the computation of the RMS of an array
         Args:
             array: Input data array
+            mask_idx: Indices of the valid pixels in the mask
+            mask_count: Number of valid pixels in the mask
 
         Returns:
             RMS of the input array
         """
-        return np.sqrt(np.mean(array[self.mask] ** 2))
+        values = array[mask_idx]
+        return np.sqrt(np.dot(values, values)/mask_count)
+
+    def _map_over_panels(self, function):
+        """
+        Applies function to all panels in a thread pool, panels are independent of each other
+        Args:
+            function: Function that takes a panel as its single argument
+
+        Returns:
+            List of the results of function, in panel order
+        """
+        with ThreadPoolExecutor() as executor:
+            return list(executor.map(function, self.panels))
 
     def fit_surface(self):
         """
-        Loops over the panels to fit the panel surfaces
+        Fits the panel surfaces, panels are independent of each other so they are solved in a thread pool
         """
-        panels = []
-        for panel in self.panels:
-            if not panel.solve():
-                panels.append(panel.label)
+        status = self._map_over_panels(lambda panel: panel.solve())
+        panels = [panel.label for panel, solved in zip(self.panels, status) if not solved]
 
         self.fitted = True
         if len(panels) > 0:
@@ -464,12 +512,12 @@ class AntennaSurface:
             raise Exception("Panels must be fitted before atempting a correction")
         self.corrections = np.where(self.mask, 0, np.nan)
         self.residuals = np.copy(self.deviation)
-        for panel in self.panels:
-            corrections = panel.get_corrections()
-            for corr in corrections:
-                ix, iy = int(corr[0]), int(corr[1])
-                self.residuals[ix, iy] -= corr[-1]
-                self.corrections[ix, iy] = -corr[-1]
+        # Each pixel belongs to a single panel, hence there are no repeated indices in the scatter below
+        corrections = np.concatenate(self._map_over_panels(lambda panel: panel.get_corrections()))
+        ix = corrections[:, 0].astype(int)
+        iy = corrections[:, 1].astype(int)
+        self.residuals[ix, iy] -= corrections[:, -1]
+        self.corrections[ix, iy] = -corrections[:, -1]
         self.phase_corrections = self._deviation_to_phase(self.corrections)
         self.phase_residuals = self._deviation_to_phase(self.residuals)
         self._build_panel_data_arrays()
@@ -578,7 +626,8 @@ class AntennaSurface:
             raise Exception('Map list and label list must be of the same size')
         nplots = len(maps)
         if parm_dict['z_lim'] is None or parm_dict['z_lim'] == "None":
-            vmax = np.nanmax(np.abs(factor * maps[0]))  # Gotten from the original map (displays the biggest variation)
+            # Gotten from the original map (displays the biggest variation), scaling the maximum rather than the map
+            vmax = np.abs(factor) * np.nanmax(np.abs(maps[0]))
             parm_dict['z_lim'] = [-vmax, vmax]
         for iplot in range(nplots):
             title = f'{prefix.capitalize()} {labels[iplot]}'
@@ -644,8 +693,9 @@ class AntennaSurface:
         ax.set_title(f'\nThreshold = {threshold:.2f} {unit}', fontsize='small')
         # set the limits of the plot to the limits of the data
         extent = [np.min(self.u_axis), np.max(self.u_axis), np.min(self.v_axis), np.max(self.v_axis)]
-        im = ax.imshow(np.full_like(self.deviation, fill_value=np.nan), cmap=cmap, interpolation="nearest",
-                       extent=extent, vmin=vmin, vmax=vmax)
+        # A single blank pixel stretched over the extent is enough to provide a mappable for the colorbar
+        im = ax.imshow(np.full((1, 1), np.nan), cmap=cmap, interpolation="nearest", extent=extent, vmin=vmin,
+                       vmax=vmax)
         self._add_resolution_to_plot(ax, extent)
         colorbar = _well_positioned_colorbar(ax, fig, im, "Screw adjustments [" + unit + "]")
         if threshold > 0:
@@ -688,28 +738,23 @@ class AntennaSurface:
             filename: ASCII file name/path
             unit: unit for panel screw adjustments ['mm','miliinches']
         """
-        outfile =  "# Screw adjustments for {0:s} {1:s} antenna\n".format(self.telescope.name, self.antenna_name)
-        outfile += "# Adjustments are in " + unit + 2*lnbr
-        outfile += "# Lower means away from subreflector" + lnbr
-        outfile += "# Raise means toward the subreflector" + lnbr
-        outfile += "# LOWER the panel if the number is POSITIVE" + lnbr
-        outfile += "# RAISE the panel if the number is NEGATIVE" + lnbr
-        outfile += 2 * lnbr
-        outfile += "{0:16s}".format('Panel')
-        nscrews = len(self.telescope.screw_description)
-        for screw in self.telescope.screw_description:
-            outfile += "{0:11s}".format(screw)
-        outfile += lnbr
+        lines = ["# Screw adjustments for {0:s} {1:s} antenna".format(self.telescope.name, self.antenna_name),
+                 "# Adjustments are in " + unit + lnbr,
+                 "# Lower means away from subreflector",
+                 "# Raise means toward the subreflector",
+                 "# LOWER the panel if the number is POSITIVE",
+                 "# RAISE the panel if the number is NEGATIVE",
+                 lnbr,
+                 "{0:16s}".format('Panel') + "".join(["{0:11s}".format(screw)
+                                                      for screw in self.telescope.screw_description])]
         fac = _convert_unit('m', unit, 'length')
         for ipanel in range(len(self.panel_labels)):
-            outfile += "{0:8s}".format(self.panel_labels[ipanel])
-            for iscrew in range(nscrews):
-                outfile += " {0:10.2f}".format(fac*self.screw_adjustments[ipanel, iscrew])
-            outfile += lnbr
-
-        lefile = open(filename, "w")
-        lefile.write(outfile)
-        lefile.close()
+            lines.append("{0:8s}".format(self.panel_labels[ipanel]) +
+                         "".join([" {0:10.2f}".format(fac*screw) for screw in self.screw_adjustments[ipanel]]))
+        lines.append("")
+
+        with open(filename, "w") as lefile:
+            lefile.write(lnbr.join(lines))
 
     def export_xds(self):
         """
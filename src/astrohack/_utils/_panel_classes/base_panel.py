@@ -1,4 +1,5 @@
 from scipy import optimize as opt
+from numba import njit
 import graphviper.utils.logger
 
 from matplotlib import pyplot as plt
@@ -18,6 +19,7 @@ icorrob = 4
 ixypara = 5
 irotpara = 6
 ifulllst = 7
+EXPERIMENTAL_MODELS = frozenset(PANEL_MODELS[icorrob+1:])
 
 warned = False
 
@@ -33,11 +35,70 @@ def set_warned(value: bool):
     warned = value
 
 
+@njit(cache=False, nogil=True)
+def _rigid_normal_equations(samples):
+    """
+    Accumulates the normal equations of the AIPS rigid panel model
+    Args:
+        samples: Array of panel samples with rows containing [xcoor, ycoor, xidx, yidx, value]
+
+    Returns:
+        The 3x3 system and its right hand side vector
+    """
+    system = np.zeros((3, 3))
+    vector = np.zeros(3)
+    for ipoint in range(samples.shape[0]):
+        xcoor = samples[ipoint, 0]
+        ycoor = samples[ipoint, 1]
+        value = samples[ipoint, -1]
+        # Points with a null deviation are not taken into account in the fit
+        if value != 0:
+            system[0, 0] += xcoor * xcoor
+            system[0, 1] += xcoor * ycoor
+            system[0, 2] += xcoor
+            system[1, 1] += ycoor * ycoor
+            system[1, 2] += ycoor
+            system[2, 2] += 1.0
+            vector[0] += value * xcoor
+            vector[1] += value * ycoor
+            vector[2] += value
+    system[1, 0] = system[0, 1]
+    system[2, 0] = system[0, 2]
+    system[2, 1] = system[1, 2]
+    return system, vector
+
+
+@njit(cache=False, nogil=True)
+def _corotated_design_matrix(samples, xc, yc, coszeta, sinzeta):
+    """
+    Builds the design matrix of a paraboloid whose axes are rotated by an angle zeta and centered at xc, yc
+    Args:
+        samples: Array of panel samples with rows containing [xcoor, ycoor, xidx, yidx, value]
+        xc: X coordinate of the paraboloid center
+        yc: Y coordinate of the paraboloid center
+        coszeta: Cosine of the rotation angle of the paraboloid axes
+        sinzeta: Sine of the rotation angle of the paraboloid axes
+
+    Returns:
+        The design matrix with columns u**2, v**2 and 1
+    """
+    system = np.ones((samples.shape[0], 3))
+    for ipoint in range(samples.shape[0]):
+        dx = samples[ipoint, 0] - xc
+        dy = samples[ipoint, 1] - yc
+        ucoor = dx * coszeta - dy * sinzeta
+        vcoor = dx * sinzeta + dy * coszeta
+        system[ipoint, 0] = ucoor * ucoor
+        system[ipoint, 1] = vcoor * vcoor
+    return system
+
+
 class BasePanel:
     markers = ['X', 'o', '*', 'P', 'D']
     colors = ['g', 'g', 'r', 'r', 'b']
     linewidth = 0.5
     linecolor = 'black'
+    INITIAL_CAPACITY = 64
 
     def __init__(self, model, screws, plot_screw_pos, plot_screw_size, label, center=None, zeta=None):
         """
@@ -48,11 +109,11 @@ class BasePanel:
             rigid: The panel samples are fitted to a rigid surface
         Corotated Paraboloids (the two bending axes are parallel and perpendicular to the radius of the antenna crossing
         the middle of the panel):
-            corotated_scipy: Paraboloid is fitted using scipy.optimize, robust but slow
+            corotated_scipy: Paraboloid is fitted using a rank tolerant linear least squares solve, robust
             corotated_lst_sq: Paraboloid is fitted using the linear algebra least squares method, fast but unreliable
             corotated_robust: Tries corotated_lst_sq, if it diverges falls back to corotated_scipy
         Experimental fitting models:
-            xy_paraboloid: fitted using scipy.optimize, bending axes are parallel to the x and y axes
+            xy_paraboloid: fitted using linear least squares, bending axes are parallel to the x and y axes
             rotated_paraboloid: fitted using scipy.optimize, bending axes can be rotated by an arbitrary angle
             full_paraboloid_lst_sq: Full 9 parameter paraboloid fitted using least_squares method, heavily overfits
         Args:
@@ -68,8 +129,12 @@ class BasePanel:
         self.screws = screws
         self.plot_screw_pos = plot_screw_pos
         self.plot_screw_size = plot_screw_size
-        self.samples = []
-        self.margins = []
+        # Points are stored as rows of [xcoor, ycoor, xidx, yidx, value] in buffers that grow geometrically, only the
+        # first _nsamp and _nmarg rows are valid
+        self._sample_buf = np.empty([self.INITIAL_CAPACITY, 5])
+        self._margin_buf = np.empty([self.INITIAL_CAPACITY, 5])
+        self._nsamp = 0
+        self._nmarg = 0
         self.corr = None
 
         if center is None:
@@ -80,37 +145,25 @@ class BasePanel:
             self.zeta = 0
         else:
             self.zeta = zeta
+        # The corotated models rotate every point by zeta
+        self._coszeta = np.cos(self.zeta)
+        self._sinzeta = np.sin(self.zeta)
         self._associate()
 
     def _associate(self):
         """
         Does the fitting method associations according to the model chosen by the user
         """
-        logger = graphviper.utils.logger.get_logger(logger_name="astrohack")
         try:
-            imodel = PANEL_MODELS.index(self.model)
-        except ValueError:
+            associate = self._model_associations[self.model]
+        except KeyError:
+            logger = graphviper.utils.logger.get_logger(logger_name="astrohack")
             logger.error("Unknown panel model: "+self.model)
             raise ValueError('Panel model not in list')
-        if imodel > icorrob:
+        if self.model in EXPERIMENTAL_MODELS:
             self._warn_experimental_method()
-        if imodel == irigid:
-            self._associate_rigid()
-        elif imodel == imean:
-            self._associate_mean()
-        elif imodel == ixypara:
-            self._associate_scipy(self._xyaxes_paraboloid, 3)
-        elif imodel == irotpara:
-            self._associate_scipy(self._rotated_paraboloid, 4)
-        elif imodel == icorscp:
-            self._associate_scipy(self._corotated_paraboloid, 3)
-        elif imodel == ifulllst:
-            self._associate_least_squares()
-        elif imodel == icorlst:
-            self._associate_corotated_lst_sq()
-        elif imodel == icorrob:
-            self._associate_robust()
-        
+        associate(self)
+
     def _warn_experimental_method(self):
         """
         Raises a warning about experimental methods if a warning has not been raised before
@@ -130,8 +183,13 @@ class BasePanel:
             NPAR: Number of paramenters in the fitting function
         """
         self.NPAR = NPAR
-        self._solve_sub = self._solve_scipy
+        if fitting_function == self._rotated_paraboloid:
+            self._solve_sub = self._solve_scipy
+        else:
+            # The other paraboloid models are linear in their parameters
+            self._solve_sub = self._solve_linear_paraboloid
         self.corr_point = self._corr_point_scipy
+        self.corr_vec = self._corr_point_scipy
         self._fitting_function = fitting_function
 
     def _associate_robust(self):
@@ -143,6 +201,7 @@ class BasePanel:
         self.NPAR = 3
         self._solve_sub = self._solve_robust
         self.corr_point = self._corr_point_corotated_lst_sq
+        self.corr_vec = self._corr_point_corotated_lst_sq
         self._fitting_function = self._corotated_paraboloid
 
     def _associate_rigid(self):
@@ -152,6 +211,7 @@ class BasePanel:
         self.NPAR = 3
         self._solve_sub = self._solve_rigid
         self.corr_point = self._corr_point_rigid
+        self.corr_vec = self._corr_point_rigid
 
     def _associate_mean(self):
         """
@@ -160,6 +220,7 @@ class BasePanel:
         self.NPAR = 1
         self._solve_sub = self._solve_mean
         self.corr_point = self._corr_point_mean
+        self.corr_vec = self._corr_vec_mean
 
     def _associate_least_squares(self):
         """
@@ -168,6 +229,7 @@ class BasePanel:
         self.NPAR = 9
         self._solve_sub = self._solve_least_squares_paraboloid
         self.corr_point = self._corr_point_least_squares_paraboloid
+        self.corr_vec = self._corr_point_least_squares_paraboloid
 
     def _associate_corotated_lst_sq(self):
         """
@@ -176,6 +238,41 @@ class BasePanel:
         self.NPAR = 3
         self._solve_sub = self._solve_corotated_lst_sq
         self.corr_point = self._corr_point_corotated_lst_sq
+        self.corr_vec = self._corr_point_corotated_lst_sq
+
+    @property
+    def samples(self):
+        """
+        Points to be fitted, numpy array with rows containing [xcoor,ycoor,xidx,yidx,value]
+        """
+        return self._sample_buf[:self._nsamp]
+
+    @property
+    def margins(self):
+        """
+        Points to be corrected but not fitted, numpy array with rows containing [xcoor,ycoor,xidx,yidx,value]
+        """
+        return self._margin_buf[:self._nmarg]
+
+    @staticmethod
+    def _append_points(buffer, npoints, values):
+        """
+        Append points to a point buffer, growing it geometrically when it is full
+        Args:
+            buffer: numpy array of shape [capacity, 5] holding the points
+            npoints: Number of valid points in buffer
+            values: numpy array of shape [nnew, 5] with the new points
+
+        Returns:
+            The buffer containing the new points and the updated number of valid points
+        """
+        nnew = npoints + len(values)
+        if nnew > buffer.shape[0]:
+            newbuf = np.empty([max(nnew, 2*buffer.shape[0]), 5])
+            newbuf[:npoints] = buffer[:npoints]
+            buffer = newbuf
+        buffer[npoints:nnew] = values
+        return buffer, nnew
 
     def add_sample(self, value):
         """
@@ -183,7 +280,7 @@ class BasePanel:
         Args:
             value: tuple/list containing point description [xcoor,ycoor,xidx,yidx,value]
         """
-        self.samples.append(value)
+        self._sample_buf, self._nsamp = self._append_points(self._sample_buf, self._nsamp, [value])
 
     def add_margin(self, value):
         """
@@ -191,7 +288,23 @@ class BasePanel:
         Args:
             value: tuple/list containing point description [xcoor,ycoor,xidx,yidx,value]
         """
-        self.margins.append(value)
+        self._margin_buf, self._nmarg = self._append_points(self._margin_buf, self._nmarg, [value])
+
+    def add_samples(self, values):
+        """
+        Add a block of points to the panel's list of points to be fitted
+        Args:
+            values: numpy array of shape [npoints, 5] with rows containing [xcoor,ycoor,xidx,yidx,value]
+        """
+        self._sample_buf, self._nsamp = self._append_points(self._sample_buf, self._nsamp, values)
+
+    def add_margins(self, values):
+        """
+        Add a block of points to the panel's list of points to be corrected, but not fitted
+        Args:
+            values: numpy array of shape [npoints, 5] with rows containing [xcoor,ycoor,xidx,yidx,value]
+        """
+        self._margin_buf, self._nmarg = self._append_points(self._margin_buf, self._nmarg, values)
 
     def solve(self):
         """
@@ -202,7 +315,7 @@ class BasePanel:
             False: in case of fallback fit
         """
         # fallback behaviour for impossible fits
-        if len(self.samples) < self.NPAR:
+        if len(self.samples) < self.NPAR or self._aligned_samples():
             self._fallback_solve()
             status = False
         else:
@@ -214,6 +327,20 @@ class BasePanel:
                 status = False
         return status
 
+    def _aligned_samples(self):
+        """
+        Cheap test for degenerate sample sets, the rigid model is linear in both X and Y, hence its normal equations are
+        singular when all samples share the same X or the same Y coordinate. The other models are left to their own
+        solvers, as a rotated frame keeps the corotated fits well posed and the least squares fits return a minimum
+        norm solution
+
+        Returns:
+            True if the samples are aligned and the model is rigid
+        """
+        if self.model != PANEL_MODELS[irigid]:
+            return False
+        return bool(np.any(np.ptp(self.samples[:, 0:2], axis=0) == 0))
+
     def _fallback_solve(self):
         """
         Changes the method association to mean surface fitting, and fits the panel with it
@@ -227,36 +354,42 @@ class BasePanel:
         9 parameter paraboloid
         """
         # ax2y2 + bx2y + cxy2 + dx2 + ey2 + gxy + hx + iy + j
-        data = np.array(self.samples)
-        system = np.full((len(self.samples), self.NPAR), 1.0)
-        system[:, 0] = data[:, 0]**2 * data[:, 1]**2
-        system[:, 1] = data[:, 0]**2 * data[:, 1]
-        system[:, 2] = data[:, 1]**2 * data[:, 0]
-        system[:, 3] = data[:, 0] ** 2
-        system[:, 4] = data[:, 1] ** 2
-        system[:, 5] = data[:, 0] * data[:, 1]
-        system[:, 6] = data[:, 0]
-        system[:, 7] = data[:, 1]
+        data = self.samples
+        xcoor = np.ascontiguousarray(data[:, 0])
+        ycoor = np.ascontiguousarray(data[:, 1])
+        xsq = xcoor * xcoor
+        ysq = ycoor * ycoor
+        system = np.empty((len(data), self.NPAR))
+        system[:, 0] = xsq * ysq
+        system[:, 1] = xsq * ycoor
+        system[:, 2] = ysq * xcoor
+        system[:, 3] = xsq
+        system[:, 4] = ysq
+        system[:, 5] = xcoor * ycoor
+        system[:, 6] = xcoor
+        system[:, 7] = ycoor
+        system[:, 8] = 1.0
         vector = data[:, -1]
         self.par, _, _ = _least_squares_fit(system, vector)
         self.solved = True
 
     def _corr_point_least_squares_paraboloid(self, xcoor, ycoor):
         """
-        Computes the correction from the fitted parameters to the 9 parameter paraboloid at (xcoor, ycoor)
+        Computes the correction from the fitted parameters to the 9 parameter paraboloid at (xcoor, ycoor), works on
+        scalars and on numpy arrays of points
         Args:
             xcoor: Coordinate of point in X
             ycoor: Coordinate of point in Y
         Returns:
             The correction at point
         """
-        # ax2y2 + bx2y + cxy2 + dx2 + ey2 + gxy + hx + iy + j
-        xsq = xcoor**2
-        ysq = ycoor**2
-        point = self.par[0]*xsq*ysq + self.par[1]*xsq*ycoor + self.par[2]*ysq*xcoor
-        point += self.par[3]*xsq + self.par[4]*ysq + self.par[5]*xcoor*ycoor
-        point += self.par[6]*xcoor + self.par[7]*ycoor + self.par[8]
-        return point
+        # ax2y2 + bx2y + cxy2 + dx2 + ey2 + gxy + hx + iy + j, evaluated in Horner form as a polynomial in x with
+        # coefficients that are polynomials in y
+        par = self.par
+        xsqcoeff = (par[0]*ycoor + par[1])*ycoor + par[3]
+        xcoeff = (par[2]*ycoor + par[5])*ycoor + par[6]
+        const = (par[4]*ycoor + par[7])*ycoor + par[8]
+        return (xsqcoeff*xcoor + xcoeff)*xcoor + const
 
     def _solve_robust(self):
         """
@@ -274,18 +407,17 @@ class BasePanel:
         paraboloid centered at the center of the panel
         """
         # a*u**2 + b*v**2 + c
-        data = np.array(self.samples)
-        system = np.full((len(self.samples), self.NPAR), 1.0)
+        data = self.samples
         xc, yc = self.center
-        system[:, 0] = ((data[:, 0] - xc) * np.cos(self.zeta) - (data[:, 1] - yc) * np.sin(self.zeta))**2  # U
-        system[:, 1] = ((data[:, 0] - xc) * np.sin(self.zeta) + (data[:, 1] - yc) * np.cos(self.zeta))**2  # V
+        system = _corotated_design_matrix(data, float(xc), float(yc), self._coszeta, self._sinzeta)
         vector = data[:, -1]
         self.par, _, _ = _least_squares_fit(system, vector)
         self.solved = True
 
     def _corr_point_corotated_lst_sq(self, xcoor, ycoor):
         """
-        Computes the correction from the least squares fitted parameters to the corotated paraboloid
+        Computes the correction from the least squares fitted parameters to the corotated paraboloid, works on scalars
+        and on numpy arrays of points
         Args:
             xcoor: Coordinate of point in X
             ycoor: Coordinate of point in Y
@@ -293,10 +425,15 @@ class BasePanel:
             The correction at point
         """
         # a*u**2 + b*v**2 + c
+        par = self.par
+        coszeta = self._coszeta
+        sinzeta = self._sinzeta
         xc, yc = self.center
-        usq = ((xcoor - xc) * np.cos(self.zeta) - (ycoor - yc) * np.sin(self.zeta))**2
-        vsq = ((xcoor - xc) * np.sin(self.zeta) + (ycoor - yc) * np.cos(self.zeta))**2
-        return self.par[0]*usq + self.par[1]*vsq + self.par[2]
+        dx = xcoor - xc
+        dy = ycoor - yc
+        ucoor = dx * coszeta - dy * sinzeta
+        vcoor = dx * sinzeta + dy * coszeta
+        return par[0]*ucoor*ucoor + par[1]*vcoor*vcoor + par[2]
 
     def _solve_scipy(self, verbose=False, x0=None):
         """
@@ -305,22 +442,26 @@ class BasePanel:
             verbose: Increase verbosity in the fitting process
         """
         logger = graphviper.utils.logger.get_logger(logger_name="astrohack")
-        devia = np.ndarray([len(self.samples)])
-        coords = np.ndarray([2, len(self.samples)])
-        for i in range(len(self.samples)):
-            devia[i] = self.samples[i][-1]
-            coords[:, i] = self.samples[i][0], self.samples[i][1]
+        # Contiguous copies, as the model is evaluated over the coordinates at every iteration of the fit
+        data = self.samples
+        devia = np.ascontiguousarray(data[:, -1])
+        coords = np.ascontiguousarray(data[:, :2].T)
 
         liminf = [-np.inf, -np.inf, -np.inf]
         limsup = [np.inf, np.inf, np.inf]
-        if x0 is None:
-            p0 = [1e2, 1e2, np.mean(devia)]
-        else:
-            p0 = x0
         if self.model == PANEL_MODELS[irotpara]:
+            if x0 is None:
+                # Start from the best paraboloid with axes parallel to x and y
+                p0 = list(self._linear_paraboloid_fit(1.0, 0.0))
+            else:
+                p0 = x0
             liminf.append(0.0)
             limsup.append(np.pi)
             p0.append(0)
+        elif x0 is None:
+            p0 = [1e2, 1e2, np.mean(devia)]
+        else:
+            p0 = x0
 
         maxfevs = [100000, 1000000, 10000000]
         for maxfev in maxfevs:
@@ -339,6 +480,33 @@ class BasePanel:
                     logger.info("Converged with less than {0:d} iterations".format(maxfev))
                 break
 
+    def _linear_paraboloid_fit(self, coszeta, sinzeta):
+        """
+        Least squares fit of a paraboloid centered at the center of the panel whose axes are rotated by a fixed angle,
+        such a paraboloid is linear in its parameters
+        Args:
+            coszeta: Cosine of the rotation angle of the paraboloid axes
+            sinzeta: Sine of the rotation angle of the paraboloid axes
+
+        Returns:
+            The fitted curvatures and Z offset
+        """
+        xc, yc = self.center
+        system = _corotated_design_matrix(self.samples, float(xc), float(yc), coszeta, sinzeta)
+        par, _, _, _ = np.linalg.lstsq(system, self.samples[:, -1], rcond=None)
+        return par
+
+    def _solve_linear_paraboloid(self):
+        """
+        Fit panel surface to the xy axes or corotated paraboloid models, which are linear in their parameters and hence
+        do not need an iterative fit
+        """
+        if self._fitting_function == self._xyaxes_paraboloid:
+            self.par = self._linear_paraboloid_fit(1.0, 0.0)
+        else:
+            self.par = self._linear_paraboloid_fit(self._coszeta, self._sinzeta)
+        self.solved = True
+
     def _xyaxes_paraboloid(self, coords, ucurv, vcurv, zoff):
         """
         Surface model to be used in fitting with scipy
@@ -374,8 +542,12 @@ class BasePanel:
         """
         x, y = coords
         xc, yc = self.center
-        u = (x - xc) * np.cos(theta) - (y - yc) * np.sin(theta)
-        v = (x - xc) * np.sin(theta) + (y - yc) * np.cos(theta)
+        costheta = np.cos(theta)
+        sintheta = np.sin(theta)
+        dx = x - xc
+        dy = y - yc
+        u = dx * costheta - dy * sintheta
+        v = dx * sintheta + dy * costheta
         return ucurv * u**2 + vcurv * v**2 + zoff
 
     def _corotated_paraboloid(self, coords, ucurv, vcurv, zoff):
@@ -395,31 +567,15 @@ class BasePanel:
         """
         x, y = coords
         xc, yc = self.center
-        u = (x - xc) * np.cos(self.zeta) - (y - yc) * np.sin(self.zeta)
-        v = (x - xc) * np.sin(self.zeta) + (y - yc) * np.cos(self.zeta)
+        u = (x - xc) * self._coszeta - (y - yc) * self._sinzeta
+        v = (x - xc) * self._sinzeta + (y - yc) * self._coszeta
         return ucurv * u**2 + vcurv * v**2 + zoff
 
     def _solve_rigid(self):
         """
         Fit panel surface using AIPS gaussian elimination model for rigid panels
         """
-        system = np.zeros([self.NPAR, self.NPAR])
-        vector = np.zeros(self.NPAR)
-        for ipoint in range(len(self.samples)):
-            if self.samples[ipoint][-1] != 0:
-                system[0, 0] += self.samples[ipoint][0] * self.samples[ipoint][0]
-                system[0, 1] += self.samples[ipoint][0] * self.samples[ipoint][1]
-                system[0, 2] += self.samples[ipoint][0]
-                system[1, 0] = system[0, 1]
-                system[1, 1] += self.samples[ipoint][1] * self.samples[ipoint][1]
-                system[1, 2] += self.samples[ipoint][1]
-                system[2, 0] = system[0, 2]
-                system[2, 1] = system[1, 2]
-                system[2, 2] += 1.0
-                vector[0] += self.samples[ipoint][-1] * self.samples[ipoint][0]
-                vector[1] += self.samples[ipoint][-1] * self.samples[ipoint][1]
-                vector[2] += self.samples[ipoint][-1]
-
+        system, vector = _rigid_normal_equations(self.samples)
         self.par = _gauss_elimination_numpy(system, vector)
         self.solved = True
         return
@@ -430,8 +586,7 @@ class BasePanel:
         """
         if len(self.samples) > 0:
             # Solve panel adjustments for rigid vertical shift only panels
-            data = np.array(self.samples)[:, -1]
-            self.par = [np.mean(data)]
+            self.par = [np.mean(self.samples[:, -1])]
         else:
             self.par = [0]
         self.solved = True
@@ -443,24 +598,17 @@ class BasePanel:
         """
         if not self.solved:
             raise Exception("Cannot correct a panel that is not solved")
-        lencorr = len(self.samples)+len(self.margins)
-        self.corr = np.ndarray([lencorr, 3])
-        icorr = 0
-        for isamp in range(len(self.samples)):
-            xc, yc = self.samples[isamp][0:2]
-            ix, iy = self.samples[isamp][2:4]
-            self.corr[icorr, :] = ix, iy, self.corr_point(xc, yc)
-            icorr += 1
-        for imarg in range(len(self.margins)):
-            xc, yc = self.margins[imarg][0:2]
-            ix, iy = self.margins[imarg][2:4]
-            self.corr[icorr, :] = ix, iy, self.corr_point(xc, yc)
-            icorr += 1
+        # Samples and margins are written directly to their slices of the corrections array
+        self.corr = np.empty([self._nsamp+self._nmarg, 3])
+        for points, corr in [(self.samples, self.corr[:self._nsamp]), (self.margins, self.corr[self._nsamp:])]:
+            corr[:, 0:2] = points[:, 2:4]
+            corr[:, 2] = self.corr_vec(points[:, 0], points[:, 1])
         return self.corr
 
     def _corr_point_scipy(self, xcoor, ycoor):
         """
-        Computes the fitted value for point [xcoor, ycoor] using the scipy models
+        Computes the fitted value for point [xcoor, ycoor] using the scipy models, works on scalars and on numpy arrays
+        of points
         Args:
             xcoor: X coordinate of point
             ycoor: Y coordinate of point
@@ -473,7 +621,8 @@ class BasePanel:
 
     def _corr_point_rigid(self, xcoor, ycoor):
         """
-        Computes fitted value for point [xcoor, ycoor] using AIPS gaussian elimination model for rigid panels
+        Computes fitted value for point [xcoor, ycoor] using AIPS gaussian elimination model for rigid panels, works on
+        scalars and on numpy arrays of points
         Args:
             xcoor: X coordinate of point
             ycoor: Y coordinate of point
@@ -481,7 +630,8 @@ class BasePanel:
         Returns:
         Fitted value at xcoor,ycoor
         """
-        return xcoor * self.par[0] + ycoor * self.par[1] + self.par[2]
+        par = self.par
+        return xcoor * par[0] + ycoor * par[1] + par[2]
 
     def _corr_point_mean(self, xcoor, ycoor):
         """
@@ -495,6 +645,18 @@ class BasePanel:
         """
         return self.par[0]
 
+    def _corr_vec_mean(self, xcoor, ycoor):
+        """
+        Computes fitted values for arrays of points using AIPS shift only panels
+        Args:
+            xcoor: X coordinates of the points
+            ycoor: Y coordinates of the points
+
+        Returns:
+        Array of fitted values at xcoor,ycoor
+        """
+        return np.full(np.shape(xcoor), self.par[0])
+
     def export_screws(self, unit='mm'):
         """
         Export screw adjustments to a numpy array in unit
@@ -505,12 +667,7 @@ class BasePanel:
             Numpy array with screw adjustments
         """
         fac = _convert_unit('m', unit, 'length')
-        nscrew = len(self.screws)
-        screw_corr = np.zeros(nscrew)
-        for iscrew in range(nscrew):
-            screw = self.screws[iscrew, :]
-            screw_corr[iscrew] = fac*self.corr_point(*screw)
-        return screw_corr
+        return fac*self.corr_vec(self.screws[:, 0], self.screws[:, 1])
 
     def plot_label(self, ax, rotate=True):
         """
@@ -559,3 +716,14 @@ class BasePanel:
                                 fill=True)
             ax.add_artist(circle)
 
+    # Association method for each panel model, looked up by model name when a panel is created
+    _model_associations = {
+        PANEL_MODELS[imean]: _associate_mean,
+        PANEL_MODELS[irigid]: _associate_rigid,
+        PANEL_MODELS[icorscp]: lambda panel: panel._associate_scipy(panel._corotated_paraboloid, 3),
+        PANEL_MODELS[icorlst]: _associate_corotated_lst_sq,
+        PANEL_MODELS[icorrob]: _associate_robust,
+        PANEL_MODELS[ixypara]: lambda panel: panel._associate_scipy(panel._xyaxes_paraboloid, 3),
+        PANEL_MODELS[irotpara]: lambda panel: panel._associate_scipy(panel._rotated_paraboloid, 4),
+        PANEL_MODELS[ifulllst]: _associate_least_squares,
+    }
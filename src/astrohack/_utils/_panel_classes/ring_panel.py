@@ -17,11 +17,11 @@ class RingPanel(BasePanel):
             rigid: The panel samples are fitted to a rigid surface
         Corotated Paraboloids (the two bending axes are parallel and perpendicular to the radius of the antenna crossing
         the middle of the panel):
-            corotated_scipy: Paraboloid is fitted using scipy.optimize, robust but slow
+            corotated_scipy: Paraboloid is fitted using a rank tolerant linear least squares solve, robust
             corotated_lst_sq: Paraboloid is fitted using the linear algebra least squares method, fast but unreliable
             corotated_robust: Tries corotated_lst_sq, if it diverges falls back to corotated_scipy
         Experimental fitting kinds:
-            xy_paraboloid: fitted using scipy.optimize, bending axes are parallel to the x and y axes
+            xy_paraboloid: fitted using linear least squares, bending axes are parallel to the x and y axes
             rotated_paraboloid: fitted using scipy.optimize, bending axes can be rotated by an arbitrary angle
             full_paraboloid_lst_sq: Full 9 parameter paraboloid fitted using least_squares method, heavily overfits
         Args:
@@ -87,10 +87,10 @@ class RingPanel(BasePanel):
 
     def is_inside(self, rad, phi):
         """
-        Check if a point is inside a panel using polar coordinates
+        Check if a point is inside a panel using polar coordinates, works on scalars and on numpy arrays of points
         Args:
-            rad: radius of the point
-            phi: angle of the point in polar coordinates
+            rad: radius of the point(s)
+            phi: angle of the point(s) in polar coordinates
 
         Returns:
             issample: True if point is inside the fitting part of the panel
@@ -98,12 +98,12 @@ class RingPanel(BasePanel):
         """
         # Simple test of polar coordinates to check that a point is
         # inside this panel
-        angle = self.theta1 <= phi <= self.theta2
-        radius = self.inrad <= rad <= self.ourad
-        inpanel = angle and radius
-        angle = self.margin_theta1 <= phi <= self.margin_theta2
-        radius = self.margin_inrad <= rad <= self.margin_ourad
-        issample = angle and radius
+        angle = (self.theta1 <= phi) & (phi <= self.theta2)
+        radius = (self.inrad <= rad) & (rad <= self.ourad)
+        inpanel = angle & radius
+        angle = (self.margin_theta1 <= phi) & (phi <= self.margin_theta2)
+        radius = (self.margin_inrad <= rad) & (rad <= self.margin_ourad)
+        issample = angle & radius
         return issample, inpanel
 
     def print_misc(self):
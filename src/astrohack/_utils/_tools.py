@@ -1,7 +1,10 @@
+import os
 import json
+import math
 import shutil
 import inspect
 
+import erfa
 import numpy as np
 import astropy.units as units
 
@@ -9,13 +12,15 @@ import graphviper.utils.logger as logger
 
 from prettytable import PrettyTable
 from textwrap import fill
-from astropy.coordinates import EarthLocation, AltAz, HADec, SkyCoord
-from astropy.time import Time
+from astropy.coordinates import Angle, EarthLocation
 from casacore import tables
 
 from astrohack._utils._conversion import _convert_unit
 from astrohack._utils._algorithms import _significant_digits
 
+RAD_TO_HOUR = _convert_unit('rad', 'hour', 'trigonometric')
+RAD_TO_DEG = _convert_unit('rad', 'deg', 'trigonometric')
+
 
 class NumpyEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -49,13 +54,12 @@ def _altaz_to_hadec(az, el, lat):
     sinlat = np.sin(lat)
     coslat = np.cos(lat)
     sinel = np.sin(el)
-    cosel = np.cos(el)
-    cosaz = np.cos(az)
-    sindec = sinlat * sinel + coslat * cosel * cosaz
+    sindec = coslat * np.cos(el) * np.cos(az)
+    sindec += sinlat * sinel
     dec = np.arcsin(sindec)
-    argarccos = (sinel - sinlat * sindec) / (coslat * np.cos(dec))
-    lt1 = argarccos < -1
-    argarccos[lt1] = -1.0
+    argarccos = sinel - sinlat * sindec
+    argarccos /= coslat * np.cos(dec)
+    np.clip(argarccos, -1.0, 1.0, out=argarccos)
     ha = np.arccos(argarccos)
     return ha, dec
 
@@ -72,8 +76,10 @@ def _hadec_to_altaz(ha, dec, lat):
     cosha = np.cos(ha)
     coslat = np.cos(lat)
     sinlat = np.sin(lat)
-    bottom = cosha * sinlat - np.tan(dec) * coslat
-    sin_el = sinlat * np.sin(dec) + coslat * np.cos(dec) * cosha
+    sindec = np.sin(dec)
+    cosdec = np.cos(dec)
+    bottom = cosha * sinlat - sindec / cosdec * coslat
+    sin_el = sinlat * sindec + coslat * cosdec * cosha
     az = np.arctan2(sinha, bottom)
     el = np.arcsin(sin_el)
     az += np.pi  # formula is starting from *South* instead of North
@@ -98,13 +104,14 @@ def _hadec_to_elevation(hadec, lat):
     return el
 
 
-def _altaz_to_hadec_astropy(az, el, time, x_ant, y_ant, z_ant):
+def _altaz_to_hadec_astropy(az, el, x_ant, y_ant, z_ant):
     """
-    Astropy convertion from Alt Az to Ha Dec, seems to be more precise but it is VERY slow
+    ERFA convertion from Alt Az to Ha Dec, as used by astropy's AltAz to HADec transformation, seems to be more precise
+    than _altaz_to_hadec. Both frames are observed frames at the same location, so the conversion does not depend on
+    time.
     Args:
         az: Azimuth
         el: Elevation
-        time: Time
         x_ant: Antenna x position in geocentric coordinates
         y_ant: Antenna y position in geocentric coordinates
         z_ant: Antenna z position in geocentric coordinates
@@ -113,13 +120,9 @@ def _altaz_to_hadec_astropy(az, el, time, x_ant, y_ant, z_ant):
 
     """
     ant_pos = EarthLocation.from_geocentric(x_ant, y_ant, z_ant, 'meter')
-    mjd_time = Time(_casa_time_to_mjd(time), format='mjd', scale='utc')
-    az_el_frame = AltAz(location=ant_pos, obstime=mjd_time)
-    ha_dec_frame = HADec(location=ant_pos, obstime=mjd_time)
-    azel_coor = SkyCoord(az * units.rad, el * units.rad, frame=az_el_frame)
-    ha_dec_coor = azel_coor.transform_to(ha_dec_frame)
+    ha, dec = erfa.ae2hd(az, el, ant_pos.lat.rad)
 
-    return ha_dec_coor.ha, ha_dec_coor.dec
+    return Angle(ha, units.rad), Angle(dec, units.rad)
 
 
 def get_default_file_name(input_file: str, output_type: str) -> str:
@@ -152,9 +155,8 @@ def _add_prefix(input_string, prefix):
     Returns: filename or path plus prefix added to the filename
 
     """
-    wrds = input_string.split('/')
-    wrds[-1] = prefix + '_' + wrds[-1]
-    return '/'.join(wrds)
+    path, sep, filename = input_string.rpartition('/')
+    return path + sep + prefix + '_' + filename
 
 
 def print_holog_obs_dict(holog_obj):
@@ -172,13 +174,13 @@ def print_holog_obs_dict(holog_obj):
 
     for ddi_key, ddi_value in holog_obj.items():
         logger.info("{ddi_key} {open_bracket}".format(ddi_key=ddi_key, open_bracket=OPEN_DICT))
-        for map_key, map_value in holog_obj[ddi_key].items():
+        for map_key, map_value in ddi_value.items():
             logger.info("{map_key: >10} {open_bracket}".format(map_key=map_key, open_bracket=OPEN_DICT))
-            for attr_key, attr_value in holog_obj[ddi_key][map_key].items():
+            for attr_key, attr_value in map_value.items():
                 if "scans" in attr_key:
                     logger.info("{attr_key: >12} {open_list}".format(attr_key=attr_key, open_list=OPEN_LIST))
 
-                    scan_list = ", ".join(list(map(str, holog_obj[ddi_key][map_key][attr_key])))
+                    scan_list = ", ".join(map(str, attr_value))
 
                     # The print justification in notebook is weird on this and seems to move according to list length
 
@@ -187,7 +189,7 @@ def print_holog_obs_dict(holog_obj):
 
                 elif "ant" in attr_key:
                     logger.info("{attr_key: >12} {open_bracket}".format(attr_key=attr_key, open_bracket=OPEN_DICT))
-                    for ant_key, ant_value in holog_obj[ddi_key][map_key][attr_key].items():
+                    for ant_key, ant_value in attr_value.items():
                         logger.info("{ant_key: >18} {open_list}".format(ant_key=ant_key, open_list=OPEN_LIST))
                         logger.info("{antenna: >25}".format(antenna=", ".join(ant_value)))
                         logger.info("{close_list: >15}".format(close_list=CLOSE_LIST))
@@ -250,36 +252,43 @@ def split_pointing_table(ms_name, antennas):
     # Need to get thea antenna-id values for the input antenna names. This is not available in the POINTING table,
     # so we build the values from the ANTENNA table.
 
-    table = "/".join((ms_name, 'ANTENNA'))
-    query = 'select NAME from {table}'.format(table=table)
+    antenna_table = os.path.join(ms_name, 'ANTENNA')
+    pointing_table = os.path.join(ms_name, 'POINTING')
+    reduced_table = os.path.join(ms_name, 'REDUCED')
 
-    ant_names = np.array(tables.taql(query).getcol('NAME'))
-    ant_id = np.arange(len(ant_names))
+    query = f'select NAME from {antenna_table}'
 
-    query_ant = np.searchsorted(ant_names, antennas)
+    ant_names = tables.taql(query).getcol('NAME')
 
-    ant_list = " or ".join(["ANTENNA_ID=={ant}".format(ant=ant) for ant in query_ant])
+    # The ANTENNA table is not sorted by name, so antenna ids are looked up by name.
+    ant_name_to_id = {ant_name: ant_id for ant_id, ant_name in enumerate(ant_names)}
 
-    # Build new POINTING table from the sub-selection of antenna values.
-    table = "/".join((ms_name, "POINTING"))
+    query_ant = []
+    for antenna in antennas:
+        if antenna not in ant_name_to_id:
+            msg = f'Antenna {antenna} not found in {ms_name}'
+            logger.error(msg)
+            raise Exception(msg)
+        query_ant.append(ant_name_to_id[antenna])
+
+    ant_list = ",".join(map(str, query_ant))
 
-    selection = "select * from {table} where {antennas}".format(table=table, antennas=ant_list)
+    # Build new POINTING table from the sub-selection of antenna values.
+    selection = f'select * from {pointing_table} where ANTENNA_ID IN [{ant_list}]'
 
     reduced = tables.taql(selection)
 
     # Copy the new table to the source measurement set.
-    table = "/".join((ms_name, 'REDUCED'))
-
-    reduced.copy(newtablename='{table}'.format(table=table), deep=True)
+    reduced.copy(newtablename=reduced_table, deep=True)
     reduced.done()
 
     # Remove old POINTING table.
-    shutil.rmtree("/".join((ms_name, 'POINTING')))
+    shutil.rmtree(pointing_table)
 
     # Rename REDUCED table to POINTING
     tables.tablerename(
-        tablename="/".join((ms_name, 'REDUCED')),
-        newtablename="/".join((ms_name, 'POINTING'))
+        tablename=reduced_table,
+        newtablename=pointing_table
     )
 
 
@@ -337,8 +346,7 @@ def _axis_to_fits_header(header: dict, axis, iaxis, axistype, unit, iswcs=True):
         if inc == 0:
             logger.error('Axis increment is zero valued')
             raise Exception
-        absdiff = abs((axis[-1] - axis[-2]) - inc) / inc
-        if absdiff > 1e-7:
+        if not np.allclose(np.diff(axis), inc, rtol=1e-7, atol=0):
             logger.error('Axis is not linear!')
             raise Exception
 
@@ -469,12 +477,12 @@ def _rad_to_hour_str(rad):
     Returns:
     xxhyymzz.zzzs
     """
-    h_float = rad * _convert_unit('rad', 'hour', 'trigonometric')
-    h_int = np.floor(h_float)
+    h_float = rad * RAD_TO_HOUR
+    h_int = math.floor(h_float)
     m_float = (h_float - h_int) * 60
-    m_int = np.floor(m_float)
+    m_int = math.floor(m_float)
     s_float = (m_float - m_int) * 60
-    return f'{int(h_int):02d}h{int(m_int):02d}m{s_float:06.3f}s'
+    return f'{h_int:02d}h{m_int:02d}m{s_float:06.3f}s'
 
 
 def _rad_to_deg_str(rad):
@@ -486,17 +494,17 @@ def _rad_to_deg_str(rad):
     Returns:
     xx\u00B0yymzz.zzzs
     """
-    d_float = rad * _convert_unit('rad', 'deg', 'trigonometric')
+    d_float = rad * RAD_TO_DEG
     if d_float < 0:
         d_float *= -1
         sign = '-'
     else:
         sign = '+'
-    d_int = np.floor(d_float)
+    d_int = math.floor(d_float)
     m_float = (d_float - d_int) * 60
-    m_int = np.floor(m_float)
+    m_int = math.floor(m_float)
     s_float = (m_float - m_int) * 60
-    return f'{sign}{int(d_int):02d}\u00B0{int(m_int):02d}m{s_float:06.3f}s'
+    return f'{sign}{d_int:02d}\u00B0{m_int:02d}m{s_float:06.3f}s'
 
 
 def _print_summary_header(filename, print_len=100, frame_char='#', frame_width=3):
@@ -520,8 +528,7 @@ def _print_summary_header(filename, print_len=100, frame_char='#', frame_width=3
     _print_centralized(filename, file_nlead, file_ntrail, frame_width, frame_char)
     print(print_len * frame_char)
 
-    stack = inspect.stack()
-    class_name = stack[1][0].f_locals["self"].__class__.__name__
+    class_name = inspect.currentframe().f_back.f_locals["self"].__class__.__name__
     doc_string = f"\nFull documentation for {class_name} objects' API at: \n" \
                  f'https://astrohack.readthedocs.io/en/stable/_api/autoapi/astrohack/mds/index.html#' \
                  f'astrohack.mds.{class_name}'
@@ -571,7 +578,7 @@ def _print_method_list(method_list, alignment='l', print_len=100):
 
 def _format_value_error(value, error, scaling, tolerance):
     """Format values based and errors based on the significant digits"""
-    if np.isfinite(value) and np.isfinite(error):
+    if math.isfinite(value) and math.isfinite(error):
         value *= scaling
         error *= scaling
         if abs(value) < tolerance:
@@ -581,7 +588,7 @@ def _format_value_error(value, error, scaling, tolerance):
         if value == 0 and error == 0:
             return f'{value} \u00b1 {error}'
         elif error > abs(value):
-            places = round(np.log10(error))
+            places = round(math.log10(error))
             if places < 0:
                 places = abs(places)
                 return f'{value:.{places}f} \u00B1 {error:.{places}f}'
@@ -589,14 +596,14 @@ def _format_value_error(value, error, scaling, tolerance):
                 if places in [-1, 0, 1]:
                     places = 2
                 if value == 0:
-                    digits = places - round(np.log10(abs(error)))
+                    digits = places - round(math.log10(abs(error)))
                 else:
-                    digits = places - round(np.log10(abs(value)))
+                    digits = places - round(math.log10(abs(value)))
                 value = _significant_digits(value, digits)
                 error = _significant_digits(error, places)
                 return f'{value} \u00b1 {error}'
         else:
-            digits = round(abs(np.log10(abs(value)))) - 1
+            digits = round(abs(math.log10(abs(value)))) - 1
             if digits in [-1, 0, 1]:
                 digits = 2
             value = _significant_digits(value, digits)
@@ -621,15 +628,11 @@ def _get_valid_state_ids(obs_modes, desired_intent="MAP_ANTENNA_SURFACE",
     Undefined : ?
     """
 
-    valid_state_ids = []
-    for i_mode, mode in enumerate(obs_modes):
-        if desired_intent in mode:
-            bad_words = 0
-            for intent in excluded_intents:
-                if intent in mode:
-                    bad_words += 1
-            if bad_words == 0:
-                valid_state_ids.append(i_mode)
-    return valid_state_ids
+    obs_modes = np.asarray(obs_modes, dtype=str)
+    valid = np.char.find(obs_modes, desired_intent) >= 0
+    for intent in excluded_intents:
+        valid &= np.char.find(obs_modes, intent) < 0
+
+    return np.flatnonzero(valid).tolist()
 
 
@@ -20,10 +20,8 @@ from rich.table import Table
 
 import astrohack
 from astrohack._utils._constants import pol_str
-from astrohack._utils._conversion import _convert_ant_name_to_id
 from astrohack._utils._dio import _check_if_file_exists
 from astrohack._utils._dio import _check_if_file_will_be_overwritten
-from astrohack._utils._dio import _load_holog_file
 from astrohack._utils._dio import _load_point_file
 from astrohack._utils._dio import _write_meta_data
 from astrohack._utils._extract_holog import _create_holog_meta_data
@@ -422,6 +420,7 @@ def extract_holog(
 
     ant_names = np.array(ctb.getcol("NAME"))
     ant_id = np.arange(len(ant_names))
+    ant_name_to_id = dict(zip(ant_names, ant_id))
     ant_pos = ctb.getcol("POSITION")
 
     ctb.close()
@@ -488,6 +487,16 @@ def extract_holog(
         lockoptions={"option": "usernoread"},
         ack=True,
     )
+
+    # Spectral windows can have different numbers of channels, hence getvarcol, which returns a dictionary keyed by
+    # row as "r1", "r2", ...
+    spw_chan_freq = spw_ctb.getvarcol("CHAN_FREQ")
+    spw_chan_width = spw_ctb.getvarcol("CHAN_WIDTH")
+    spw_eff_bw = spw_ctb.getvarcol("EFFECTIVE_BW")
+    spw_ref_freq = spw_ctb.getcol("REF_FREQUENCY")
+    spw_total_bw = spw_ctb.getcol("TOTAL_BANDWIDTH")
+    spw_ctb.close()
+
     pol_ctb = ctables.table(
         os.path.join(extract_holog_params['ms_name'], "POLARIZATION"),
         readonly=True,
@@ -495,6 +504,9 @@ def extract_holog(
         ack=True,
     )
 
+    pol_corr_type = pol_ctb.getvarcol("CORR_TYPE")
+    pol_ctb.close()
+
     obs_ctb = ctables.table(
         os.path.join(extract_holog_params['ms_name'], "OBSERVATION"),
         readonly=True,
@@ -504,6 +516,7 @@ def extract_holog(
 
     telescope_name = obs_ctb.getcol("TELESCOPE_NAME")[0]
     start_time_unix = obs_ctb.getcol('TIME_RANGE')[0][0] - 3506716800.0
+    obs_ctb.close()
     time = Time(start_time_unix, format='unix').jyear
 
     # If we have an EVLA run from before 2023 the pointing table needs to be fixed.
@@ -517,45 +530,39 @@ def extract_holog(
             ack=True,
         )
 
-        if "pnt_tbl:fixed" not in his_ctb.getcol("MESSAGE"):
+        history_messages = his_ctb.getcol("MESSAGE")
+        his_ctb.close()
+
+        if "pnt_tbl:fixed" not in history_messages:
             logger.error(
                 "Pointing table not corrected, users should apply function astrohack.dio.fix_pointing_table() to "
                 "remedy this.")
 
             return None
 
-        his_ctb.close()
-
     count = 0
     delayed_list = []
+    chunk_list = []
 
     for ddi_name in holog_obs_dict.keys():
         ddi = int(ddi_name.replace('ddi_', ''))
         spw_setup_id = ddi_spw[ddi]
         pol_setup_id = ddpol_indexol[ddi]
+        spw_row = "r{row}".format(row=spw_setup_id + 1)
+        pol_row = "r{row}".format(row=pol_setup_id + 1)
 
         extract_holog_params["ddi"] = ddi
         extract_holog_params["chan_setup"] = {}
         extract_holog_params["pol_setup"] = {}
-        extract_holog_params["chan_setup"]["chan_freq"] = \
-            spw_ctb.getcol("CHAN_FREQ", startrow=spw_setup_id, nrow=1)[0, :]
+        extract_holog_params["chan_setup"]["chan_freq"] = spw_chan_freq[spw_row][0, :]
+        extract_holog_params["chan_setup"]["chan_width"] = spw_chan_width[spw_row][0, :]
+        extract_holog_params["chan_setup"]["eff_bw"] = spw_eff_bw[spw_row][0, :]
+        extract_holog_params["chan_setup"]["ref_freq"] = spw_ref_freq[spw_setup_id]
+        extract_holog_params["chan_setup"]["total_bw"] = spw_total_bw[spw_setup_id]
 
-        extract_holog_params["chan_setup"]["chan_width"] = \
-            spw_ctb.getcol("CHAN_WIDTH", startrow=spw_setup_id, nrow=1)[0, :]
+        extract_holog_params["pol_setup"]["pol"] = pol_str[pol_corr_type[pol_row][0, :]]
 
-        extract_holog_params["chan_setup"]["eff_bw"] = \
-            spw_ctb.getcol("EFFECTIVE_BW", startrow=spw_setup_id, nrow=1)[0, :]
-
-        extract_holog_params["chan_setup"]["ref_freq"] = \
-            spw_ctb.getcol("REF_FREQUENCY", startrow=spw_setup_id, nrow=1)[0]
-
-        extract_holog_params["chan_setup"]["total_bw"] = \
-            spw_ctb.getcol("TOTAL_BANDWIDTH", startrow=spw_setup_id, nrow=1)[0]
-
-        extract_holog_params["pol_setup"]["pol"] = pol_str[
-            pol_ctb.getcol("CORR_TYPE", startrow=pol_setup_id, nrow=1)[0, :]]
-
-        extract_holog_params["telescope_name"] = obs_ctb.getcol("TELESCOPE_NAME")[0]
+        extract_holog_params["telescope_name"] = telescope_name
 
         # Loop over all beam_scan_ids, a beam_scan_id can consist of more than one scan in a measurement set (this is
         # the case for the VLA pointed mosaics).
@@ -579,10 +586,13 @@ def extract_holog(
                     map_ant_name_list = []
                     ref_ant_per_map_ant_name_list = []
                     for map_ant_str in holog_obs_dict[ddi_name][holog_map_key]['ant'].keys():
-                        ref_ant_ids = np.array(_convert_ant_name_to_id(ant_names, list(
-                            holog_obs_dict[ddi_name][holog_map_key]['ant'][map_ant_str])))
+                        ref_ant_ids = np.sort(np.array(
+                            [ant_name_to_id[ref_ant] for ref_ant in
+                             holog_obs_dict[ddi_name][holog_map_key]['ant'][map_ant_str] if ref_ant in ant_name_to_id],
+                            dtype=int
+                        ))
 
-                        map_ant_id = _convert_ant_name_to_id(ant_names, map_ant_str)[0]
+                        map_ant_id = ant_name_to_id[map_ant_str]
 
                         ref_ant_per_map_ant_list.append(ref_ant_ids)
                         map_ant_list.append(map_ant_id)
@@ -604,33 +614,26 @@ def extract_holog(
 
                     if parallel:
                         delayed_list.append(
-                            dask.delayed(_extract_holog_chunk)(
-                                dask.delayed(extract_holog_params)
-                            )
+                            dask.delayed(_extract_holog_chunk)(extract_holog_params.copy())
                         )
                     else:
-                        _extract_holog_chunk(extract_holog_params)
+                        chunk_list.append(_extract_holog_chunk(extract_holog_params))
 
                     count += 1
 
                 else:
                     logger.warning("DDI " + str(ddi) + " has no holography data to extract.")
 
-    spw_ctb.close()
-    pol_ctb.close()
-    obs_ctb.close()
-
     if parallel:
-        dask.compute(delayed_list)
+        chunk_list = dask.compute(delayed_list)[0]
 
     if count > 0:
         logger.info("Finished processing")
 
-        holog_dict = _load_holog_file(
-            holog_file=extract_holog_params["holog_name"],
-            dask_load=True,
-            load_pnt_dict=False
-        )
+        # Describe the written file from what the chunks report instead of walking and reopening it
+        holog_dict = {}
+        for ddi_key, holog_map_key, holog_xds_dict in chunk_list:
+            holog_dict.setdefault(ddi_key, {})[holog_map_key] = holog_xds_dict
 
         extract_holog_params['telescope_name'] = telescope_name
 
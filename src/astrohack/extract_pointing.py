@@ -1,7 +1,7 @@
 import graphviper.utils.parameter
 import graphviper.utils.logger as logger
 
-from astrohack._utils._dio import _load_point_file, _check_if_file_will_be_overwritten, _check_if_file_exists
+from astrohack._utils._dio import _check_if_file_will_be_overwritten, _check_if_file_exists
 from astrohack._utils._dio import _write_meta_data
 from astrohack._utils._extract_point import _extract_pointing
 from astrohack._utils._tools import get_default_file_name
@@ -86,7 +86,6 @@ def extract_pointing(
     )
 
     logger.info(f"Finished processing")
-    point_dict = _load_point_file(file=extract_pointing_params["point_name"], dask_load=True)
 
     pointing_mds = AstrohackPointFile(extract_pointing_params['point_name'])
     pointing_mds.open()
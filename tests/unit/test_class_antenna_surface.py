@@ -65,8 +65,8 @@ class TestClassAntennaSurface:
         compnsampp0 = 67
         self.tant.compile_panel_points()
         assert len(self.tant.panels[0].samples) == compnsampp0, 'Number of samples in panel is different from reference'
-        assert self.tant.panels[0].samples[0] == compvaluep0, 'Point data in Panel is different from what is ' \
-                                                              'expected'
+        assert np.all(self.tant.panels[0].samples[0] == compvaluep0), 'Point data in Panel is different from what ' \
+                                                                      'is expected'
 
     def test_fit_surface(self):
         """
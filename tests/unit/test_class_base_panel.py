@@ -25,8 +25,8 @@ class TestBasePanel:
         lepanel = BasePanel(PANEL_MODELS[imean], screws, screws, 0.1, label)
         assert lepanel.label == label, "Internal panel label not what expected"
         assert lepanel.model == PANEL_MODELS[imean], "Internal model does not match input"
-        assert lepanel.samples == [], 'List of samples should be empty'
-        assert lepanel.margins == [], 'list of pixels in the margin should be empty'
+        assert len(lepanel.samples) == 0, 'List of samples should be empty'
+        assert len(lepanel.margins) == 0, 'list of pixels in the margin should be empty'
         assert lepanel.corr is None, 'List of corrections should be None'
         assert not lepanel.solved, 'Panel cannot be solved at creation'
         with pytest.raises(Exception):
@@ -47,7 +47,7 @@ class TestBasePanel:
         assert len(lepanel.samples) == nsamp, 'Internal number of samples do not match the expected number of samples'
         assert len(lepanel.margins) == nsamp, 'Internal list of points does not have the expected size'
         for i in range(nsamp):
-            assert lepanel.samples[i] == point, '{0:d}-eth point does not match input point'.format(i)
+            assert np.all(lepanel.samples[i] == point), '{0:d}-eth point does not match input point'.format(i)
         return
 
     def test_mean_model(self):
@@ -103,6 +103,10 @@ class TestBasePanel:
             assert abs(rigidpanel.par[ipar]-expectedpar[ipar])/abs(expectedpar[ipar]) < self.tolerance, feedback
         rigidpanel.get_corrections()
         assert len(rigidpanel.corr) == nside**2, 'Number of corrected points do not match number of samples'
+        ix, iy = rigidpanel.corr[-1, 0:2]
+        assert abs(rigidpanel.corr[-1, 2] - rigidpanel.corr_point(ix, iy)) < self.tolerance, 'Vectorized correction ' \
+                                                                                           'does not match the ' \
+                                                                                           'point correction'
         onecorr = rigidpanel.corr_point(0, 0)
         assert abs(onecorr - expectedpar[2])/expectedpar[2] < self.tolerance, 'Correction for a point did not match ' \
                                                                               'the expected value'
@@ -112,6 +116,39 @@ class TestBasePanel:
             assert abs(screw - fac*expectedpar[2]) < self.tolerance, 'mm screw adjustments not within 0.1% ' \
                                                                         'tolerance of the expected value'
 
+    def test_aligned_samples_fallback(self):
+        """
+        Tests that a panel whose samples all share the same X coordinate falls back to the mean model
+        """
+        screws = np.zeros([4, 2])
+        nside = 32
+        expectedmean = 2.5
+        rigidpanel = BasePanel(PANEL_MODELS[irigid], screws, screws, 0.1, 'test')
+        for iy in range(nside):
+            rigidpanel.add_sample([0, iy, 0, iy, expectedmean])
+        assert not rigidpanel.solve(), 'Fit of aligned samples should fall back to the mean model'
+        assert rigidpanel._solve_sub == rigidpanel._solve_mean, 'Fallback did not associate the mean solving method'
+        assert abs(rigidpanel.par[0] - expectedmean)/expectedmean < self.tolerance, 'Did not recover the expected mean'
+
+    def test_aligned_samples_corotated(self):
+        """
+        Tests that corotated panels with a non-zero center angle are still fitted when all samples share the same X
+        """
+        expectedpar = [2, 3, 0.5]
+        screws = np.zeros([4, 2])
+        nside = 32
+        for imodel in [icorlst, icorscp, icorrob]:
+            corotparapanel = BasePanel(PANEL_MODELS[imodel], screws, screws, 0.1, 'test', zeta=0.6)
+            for iy in range(nside):
+                ycoor = iy / (nside - 1)
+                value = corotparapanel._corotated_paraboloid([0.5, ycoor], *expectedpar)
+                corotparapanel.add_sample([0.5, ycoor, 0, iy, value])
+            assert corotparapanel.solve(), 'Fit of aligned samples should not fall back for '+PANEL_MODELS[imodel]
+            for ipar in range(3):
+                feedback = '{0:d}-eth parameter does not match its expected value'.format(ipar)
+                assert abs(corotparapanel.par[ipar] - expectedpar[ipar]) / abs(expectedpar[ipar]) < self.tolerance, \
+                    feedback
+
     def test_xyparaboloid_scipy_model(self):
         """
         Tests the whole usage of a panel of the xyparaboloid model
@@ -120,7 +157,8 @@ class TestBasePanel:
         screws = np.zeros([4, 2])
         nside = 32
         xyparapanel = BasePanel(PANEL_MODELS[ixypara], screws, screws, 0.1, 'test')
-        assert xyparapanel._solve_sub == xyparapanel._solve_scipy, 'Incorrect overloading of scipy solving method'
+        assert xyparapanel._solve_sub == xyparapanel._solve_linear_paraboloid, 'Incorrect overloading of linear ' \
+                                                                               'paraboloid solving method'
         assert xyparapanel.corr_point == xyparapanel._corr_point_scipy, 'Incorrect overloading of scipy point ' \
                                                                         'correction method'
         assert xyparapanel._fitting_function == xyparapanel._xyaxes_paraboloid, 'Incorrect overloading of XY '\
@@ -187,7 +225,8 @@ class TestBasePanel:
         screws = np.zeros([4, 2])
         nside = 32
         corotparapanel = BasePanel(PANEL_MODELS[icorscp], screws, screws, 0.1, 'test')
-        assert corotparapanel._solve_sub == corotparapanel._solve_scipy, 'Incorrect overloading of scipy solving method'
+        assert corotparapanel._solve_sub == corotparapanel._solve_linear_paraboloid, 'Incorrect overloading of ' \
+                                                                                     'linear paraboloid solving method'
         assert corotparapanel.corr_point == corotparapanel._corr_point_scipy, 'Incorrect overloading of scipy point ' \
                                                                               'correction method'
         assert corotparapanel._fitting_function == corotparapanel._corotated_paraboloid, 'Incorrect overloading of ' \
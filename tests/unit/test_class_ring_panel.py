@@ -74,3 +74,9 @@ class TestRingPanel:
         assert (not issample) and (not isinpanel), 'Point on the other side of the surface must be fully outside panel'
         issample, isinpanel = self.panel.is_inside((self.inrad + self.ourad) / 2, 1.1 * self.angle)
         assert (not issample) and isinpanel, 'Point at margin must be inside but not a sample'
+        midrad = (self.inrad + self.ourad) / 2
+        rads = np.full(3, midrad)
+        phis = np.array([1.5, 3.5, 1.1]) * self.angle
+        issample, isinpanel = self.panel.is_inside(rads, phis)
+        assert np.all(issample == [True, False, False]), 'Array of points must be classified as samples point by point'
+        assert np.all(isinpanel == [True, False, True]), 'Array of points must be classified as inside point by point'